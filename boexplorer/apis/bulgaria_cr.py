@@ -26,6 +26,11 @@ class BulgarianCR(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 4
+
     @property
     def http_headers(self):
         return None
@@ -54,7 +59,8 @@ class BulgarianCR(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -111,6 +117,14 @@ class BulgarianCR(API):
         """Querying company name extra parameters"""
         return {"selectedSearchFilter": 1}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return {"ident": identifier}
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return None
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         return {}
@@ -165,29 +179,37 @@ class BulgarianCR(API):
         """Extract main data body from json data"""
         return json_data
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def company_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = {}
+        self.context.pre_processed = {}
         for section in data["sections"]:
             section_name = section["nameCode"]
-            #self.pre_processed[section_name] = {}
+            #self.context.pre_processed[section_name] = {}
             for subdeed in section["subDeeds"]:
                 subdeed_name = subdeed["sectionName"]
-                #self.pre_processed[section_name][subdeed_name] = {}
+                #self.context.pre_processed[section_name][subdeed_name] = {}
                 for group in subdeed["groups"]:
                     group_name = group["nameCode"]
-                    #self.pre_processed[section_name][subdeed_name][group_name] = {}
+                    #self.context.pre_processed[section_name][subdeed_name][group_name] = {}
                     for field in group["fields"]:
                         field_name = field["nameCode"]
                         selector = Selector(text=field["htmlData"])
                         text = " ".join(selector.xpath('//text()').getall())
                         latin = self.from_local_characters(text)
-                        #self.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
-                        self.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
+                        #self.context.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
+                        self.context.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
                         print(f"{field_name}: {latin} {text}")
-        print(self.pre_processed)
+        print(self.context.pre_processed)
 
     def person_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = None
+        self.context.pre_processed = None
 
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
@@ -254,8 +276,8 @@ class BulgarianCR(API):
             return self.person_identifier(item)
 
     def _extract_address(self) -> dict:
-        if hasattr(self, "pre_processed"):
-            address_data = self.pre_processed['CR_F_5_L']['text']
+        if self.context.pre_processed:
+            address_data = self.context.pre_processed['CR_F_5_L']['text']
             next_data = address_data.split('Държава:')
             next_data = next_data[-1].split('Област:')
             country = next_data[0].strip()
@@ -328,7 +350,7 @@ class BulgarianCR(API):
             return None
 
     def _extract_creation_data(self) -> dict:
-        creation_data = self.pre_processed['CR_F_1_L']['date']
+        creation_data = self.context.pre_processed['CR_F_1_L']['date']
         return creation_data
 
     def creation_date(self, item: dict) -> Optional[str]:
@@ -396,10 +418,10 @@ class BulgarianCR(API):
 
     def update_date(self, item: dict) -> str:
         """Get update date"""
-        if not hasattr(self, "pre_processed"):
+        if not self.context.pre_processed:
             return datetime.now().strftime("%Y-%m-%d")
         else:
-            dates = [self.pre_processed[field]['date'].split("T")[0] for field in self.pre_processed]
+            dates = [self.context.pre_processed[field]['date'].split("T")[0] for field in self.context.pre_processed]
             updated = sorted(dates, key=lambda d: datetime.strptime(d, "%Y-%m-%d"))[-1]
             return updated
 
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class SearchContext:
+    """Transient state for a single search against a source"""
+    text: Optional[str] = None
+    search_type: Optional[str] = None
+    pre_processed: Optional[dict] = None
+
+
+class UnboundContext(SearchContext):
+    """Context of an API not bound to a search: reads see the defaults, writes raise"""
+
+    def __init__(self):
+        pass
+
+    def __setattr__(self, name, value):
+        raise RuntimeError(f"Setting {name} on an API not bound to a search (use api.bind)")
+
+UNBOUND = UnboundContext()
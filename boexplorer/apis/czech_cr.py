@@ -27,6 +27,11 @@ class CzechCR(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 2
+
     @property
     def http_headers(self):
         return None
@@ -55,7 +60,8 @@ class CzechCR(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -112,6 +118,14 @@ class CzechCR(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return None
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         #return {"id": company_data["companyId"]}
@@ -170,6 +184,14 @@ class CzechCR(API):
         """Extract main data body from json data"""
         return extract_items(json_data)
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def company_prepocessing(self, data: dict) -> dict:
         pass
 
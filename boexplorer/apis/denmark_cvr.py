@@ -6,7 +6,6 @@ from parsel import Selector
 from boexplorer.apis.protocol import API
 from boexplorer.utils.dates import current_date
 from boexplorer.download.authentication import authenticator
-from boexplorer.download.stealth import  session_cookie
 
 class DenmarkCVR(API):
     """Handle accessing Danish CVR api"""
@@ -26,6 +25,11 @@ class DenmarkCVR(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 2
+
     @property
     def http_headers(self):
         return {"Accept": "application/json, text/plain, */*",
@@ -70,9 +74,9 @@ class DenmarkCVR(API):
         return True
 
     @property
-    def session_cookie(self):
-        user_agent, cookie = session_cookie("https://datacvr.virk.dk", 'S9SESSIONID')
-        return user_agent, cookie
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
+        return "https://datacvr.virk.dk", 'S9SESSIONID'
 
     @property
     def company_search_url(self) -> str:
@@ -140,6 +144,14 @@ class DenmarkCVR(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return self.query_company_name_params(identifier)
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         #return {"id": company_data["companyId"]}
@@ -208,29 +220,37 @@ class DenmarkCVR(API):
         else:
             return []
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def company_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = {}
+        self.context.pre_processed = {}
         for section in data["sections"]:
             section_name = section["nameCode"]
-            #self.pre_processed[section_name] = {}
+            #self.context.pre_processed[section_name] = {}
             for subdeed in section["subDeeds"]:
                 subdeed_name = subdeed["sectionName"]
-                #self.pre_processed[section_name][subdeed_name] = {}
+                #self.context.pre_processed[section_name][subdeed_name] = {}
                 for group in subdeed["groups"]:
                     group_name = group["nameCode"]
-                    #self.pre_processed[section_name][subdeed_name][group_name] = {}
+                    #self.context.pre_processed[section_name][subdeed_name][group_name] = {}
                     for field in group["fields"]:
                         field_name = field["nameCode"]
                         selector = Selector(text=field["htmlData"])
                         text = " ".join(selector.xpath('//text()').getall())
                         latin = self.from_local_characters(text)
-                        #self.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
-                        self.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
+                        #self.context.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
+                        self.context.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
                         print(f"{field_name}: {latin} {text}")
-        print(self.pre_processed)
+        print(self.context.pre_processed)
 
     def person_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = None
+        self.context.pre_processed = None
 
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
@@ -37,6 +37,11 @@ class EstoniaRIK(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 2
+
     @property
     def http_headers(self):
         return None
@@ -65,7 +70,8 @@ class EstoniaRIK(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -106,6 +112,8 @@ class EstoniaRIK(API):
     @property
     def page_number_par(self) -> Tuple[str, int]:
         """Page number parameter"""
+        # The SOAP query has no page parameter, so searches get a single page of up to
+        # evarv (page_size_max) results
         return None, 0
 
     @property
@@ -139,6 +147,14 @@ class EstoniaRIK(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return None
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         #return {"id": company_data["companyId"]}
@@ -218,6 +234,14 @@ class EstoniaRIK(API):
         """Extract main data body from json data"""
         return json_data["keha"]["ettevotjad"]["item"]
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def extract_person_data(self, json_data: dict) -> dict:
         """Extract main data body from json data"""
         out = []
@@ -1,8 +1,21 @@
 from typing import Optional, Tuple, Union
 
 from boexplorer.apis.protocol import API
+from boexplorer.config import app_config
 from boexplorer.data.data import lookup_scheme
 
+# LEI record attributes read by the accessors (None keeps the whole attribute)
+RECORD_FIELDS = {"lei": None,
+                 "entity": ("legalName", "jurisdiction", "registeredAs", "registeredAt",
+                            "legalAddress", "headquartersAddress", "creationDate"),
+                 "registration": ("lastUpdateDate", "status", "corroborationLevel")}
+# LEI record relationships read by extract_links
+RECORD_RELATIONSHIPS = ("direct-parent", "ultimate-parent")
+
+def sparse_fields():
+    """Whether to request and keep only the LEI record fields that are used"""
+    return app_config.get("gleif", {}).get("sparse_fields", True)
+
 
 class GLEIF(API):
     """Handle accessing GLEIF api"""
@@ -24,6 +37,11 @@ class GLEIF(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 8
+
     @property
     def http_headers(self):
         return None
@@ -52,7 +70,8 @@ class GLEIF(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -103,8 +122,28 @@ class GLEIF(API):
     @property
     def query_company_name_extra(self) -> str:
         """Querying company name extra parameters"""
+        if sparse_fields():
+            # JSON:API sparse fieldset, trimming unused attributes and relationships
+            return {"fields[lei-records]": ",".join(list(RECORD_FIELDS) + list(RECORD_RELATIONSHIPS))}
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return {"filter[lei]": identifier}
+
+    @property
+    def lei_batch_size(self) -> int:
+        """Maximum LEIs per batched lookup"""
+        return 100
+
+    def query_lei_batch_params(self, leis: list) -> dict:
+        """Querying batch of LEI records parameters"""
+        return {"filter[lei]": ",".join(leis)}
+
     def query_company_detail_params(self, company_data: dict) -> dict:
         """Querying company detail parameters"""
         return {}
@@ -148,10 +187,38 @@ class GLEIF(API):
     def extract_data(self, json_data: dict) -> dict:
         """Extract main data body from json data"""
         if "data" in json_data:
+            if sparse_fields() and isinstance(json_data['data'], list):
+                return [self.sparse_record(item) for item in json_data['data']]
             return json_data['data']
         else:
             return []
 
+    def sparse_record(self, item: dict) -> dict:
+        """LEI record trimmed to the fields read by the accessors (other items unchanged)"""
+        if item.get("type") != "lei-records":
+            return item
+        attributes = {}
+        for name, fields in RECORD_FIELDS.items():
+            value = item["attributes"].get(name)
+            if fields is not None and isinstance(value, dict):
+                value = {field: value[field] for field in fields if field in value}
+            attributes[name] = value
+        relationships = {name: link for name, link in item.get("relationships", {}).items()
+                         if name in RECORD_RELATIONSHIPS}
+        return {"type": item["type"], "id": item.get("id"), "attributes": attributes,
+                "relationships": relationships}
+
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        if "meta" in json_data and "pagination" in json_data["meta"]:
+            return json_data["meta"]["pagination"]["total"]
+        else:
+            return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
         if json_data["data"]["type"] == "lei-records":
@@ -298,34 +365,22 @@ class GLEIF(API):
 
     def interest_details(self, item: dict) -> str:
         """Get interest details"""
-        return f"LEI RelationshipType: {relationship_type(item)}"
+        return f"LEI RelationshipType: {self.relationship_type(item)}"
 
     def interest_start_date(self, item: dict) -> str:
         """Get interest start date"""
-        start_date = False
-        if 'RelationshipPeriods' in data['Relationship']:
-            periods = data['Relationship']['RelationshipPeriods']
-            for period in periods:
-                if 'StartDate' in period and 'PeriodType' in period:
-                    if period['PeriodType'] == "RELATIONSHIP_PERIOD":
-                        interestStartDate = period['StartDate']
-                    else:
-                        start_date = period['StartDate']
-        if not start_date:
-            if not interestStartDate: interestStartDate = ""
-        else:
-            if not interestStartDate: interestStartDate = start_date
-        return interestStartDate
+        periods = item["attributes"]["relationship"].get("periods") or []
+        start_dates = [period["startDate"] for period in periods
+                       if period.get("type") == "RELATIONSHIP_PERIOD" and period.get("startDate")]
+        if not start_dates:
+            start_dates = [period["startDate"] for period in periods if period.get("startDate")]
+        return start_dates[0].split("T")[0] if start_dates else None
 
     def extract_links(self, data: dict) -> dict:
-        """Extract links"""
+        """Extract parent relationship record links (parents reported as exceptions are skipped)"""
         rel_links = {}
-        item = extract_item(data)
-        for rel in item["relationships"]:
-            if rel.endswith("parent"):
+        for rel, value in data.get("relationships", {}).items():
+            if rel.endswith("parent") and "relationship-record" in value["links"]:
                 rel_type = rel.split("-")[0]
-                if "reporting-exception" in item["relationships"][rel]["links"]:
-                    rel_links[rel_type] = item["relationships"][rel]["links"]["reporting-exception"]
-                else:
-                    rel_links[rel_type] = item["relationships"][rel]["links"]["relationship-record"]
+                rel_links[rel_type] = value["links"]["relationship-record"]
         return rel_links
@@ -23,6 +23,11 @@ class LatviaUR(API):
         """API http method"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 4
+
     @property
     def http_headers(self):
         return None
@@ -51,7 +56,8 @@ class LatviaUR(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -112,6 +118,14 @@ class LatviaUR(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return {"q": identifier}
+
     def query_company_detail_params(self, company_data: dict) -> dict:
         """Querying company detail parameters"""
         return {}
@@ -168,6 +182,17 @@ class LatviaUR(API):
         """Extract main data body from json data"""
         return json_data["response"]["docs"]
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        if "numFound" in json_data["response"]:
+            return json_data["response"]["numFound"]
+        else:
+            return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
         if json_data["type"] == "lventity":
@@ -26,6 +26,11 @@ class NigerianCAC(API):
         """API http method"""
         return 90
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 4
+
     @property
     def http_headers(self):
         return None
@@ -54,7 +59,8 @@ class NigerianCAC(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -111,6 +117,14 @@ class NigerianCAC(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        return None
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return None
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         #return {"id": company_data["companyId"]}
@@ -181,26 +195,34 @@ class NigerianCAC(API):
         else:
             return None
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        return None
+
     def company_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = {}
+        self.context.pre_processed = {}
         for section in data["sections"]:
             section_name = section["nameCode"]
-            #self.pre_processed[section_name] = {}
+            #self.context.pre_processed[section_name] = {}
             for subdeed in section["subDeeds"]:
                 subdeed_name = subdeed["sectionName"]
-                #self.pre_processed[section_name][subdeed_name] = {}
+                #self.context.pre_processed[section_name][subdeed_name] = {}
                 for group in subdeed["groups"]:
                     group_name = group["nameCode"]
-                    #self.pre_processed[section_name][subdeed_name][group_name] = {}
+                    #self.context.pre_processed[section_name][subdeed_name][group_name] = {}
                     for field in group["fields"]:
                         field_name = field["nameCode"]
                         selector = Selector(text=field["htmlData"])
                         text = " ".join(selector.xpath('//text()').getall())
                         latin = self.from_local_characters(text)
-                        #self.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
-                        self.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
+                        #self.context.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
+                        self.context.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
                         print(f"{field_name}: {latin} {text}")
-        print(self.pre_processed)
+        print(self.context.pre_processed)
 
     def person_prepocessing(self, data: dict) -> dict:
         pass
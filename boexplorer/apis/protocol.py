@@ -1,10 +1,24 @@
+import copy
 from abc import abstractmethod, abstractproperty
 from typing import Optional, Protocol, Tuple, Union, runtime_checkable
 
+from boexplorer.apis.context import UNBOUND, SearchContext
+
 
 @runtime_checkable
 class API(Protocol):
 
+    def bind(self, context: SearchContext) -> "API":
+        """Copy of API holding per-search context"""
+        bound = copy.copy(self)
+        bound._context = context
+        return bound
+
+    @property
+    def context(self) -> SearchContext:
+        """Per-search context (read-only defaults if API not bound)"""
+        return getattr(self, "_context", None) or UNBOUND
+
     @abstractproperty
     def authenticator(self) -> str:
         """API authenticator"""
@@ -17,6 +31,10 @@ class API(Protocol):
     def http_timeout(self) -> int:
         """API http timeout (seconds)"""
 
+    @abstractproperty
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+
     @abstractproperty
     def http_post(self) -> dict:
         """API http post"""
@@ -26,8 +44,8 @@ class API(Protocol):
         """API post pagination"""
 
     @property
-    def session_cookie(self):
-        """Get session cookeie"""
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
 
     @abstractproperty
     def company_search_url(self) -> str:
@@ -35,7 +53,7 @@ class API(Protocol):
 
     @abstractmethod
     def company_detail_url(self, company_data: dict) -> str:
-        """API company detail url"""
+        """API company detail url (None if company_data already holds the detail)"""
 
     @abstractproperty
     def person_search_url(self) -> str:
@@ -73,6 +91,14 @@ class API(Protocol):
     def query_company_name_extra(self) -> str:
         """Querying company name extra parameters"""
 
+    @abstractmethod
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+
+    @abstractmethod
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+
     @abstractproperty
     def query_company_detail_params(self, company_data: dict) -> dict:
         """Querying company detail parameters"""
@@ -109,6 +135,14 @@ class API(Protocol):
     def extract_data(self, json_data: dict) -> dict:
         """Extract main data body from json data"""
 
+    @abstractmethod
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+
+    @abstractmethod
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+
     @abstractmethod
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
@@ -1,6 +1,7 @@
 import re
 from typing import Optional, Tuple, Union
 
+import pycountry
 from parsel import Selector
 
 from boexplorer.apis.protocol import API
@@ -8,6 +9,9 @@ from boexplorer.utils.dates import current_date
 from boexplorer.download.authentication import authenticator
 from boexplorer.config import app_config
 
+UK_COUNTRIES = ("united kingdom", "england", "wales", "england and wales", "scotland",
+                "northern ireland", "great britain", "uk")
+
 class UKPSC(API):
     """Handle accessing UK PSC api"""
 
@@ -27,6 +31,11 @@ class UKPSC(API):
         """API http timeout (seconds)"""
         return 15
 
+    @property
+    def http_concurrency(self) -> int:
+        """Maximum concurrent requests to API"""
+        return 4
+
     @property
     def http_headers(self):
         return None
@@ -35,7 +44,7 @@ class UKPSC(API):
     def http_post(self) -> dict:
         """API http post"""
         return {"company_search": False,
-                "company_detail": None,
+                "company_detail": False,
                 "company_persons": False,
                 "person_search": None,
                 "person_detail": None}
@@ -44,7 +53,7 @@ class UKPSC(API):
     def return_json(self) -> dict:
         """API returns json"""
         return {"company_search": True,
-                "company_detail": None,
+                "company_detail": True,
                 "company_persons": True,
                 "person_search": None,
                 "person_detail": None}
@@ -55,7 +64,8 @@ class UKPSC(API):
         return False
 
     @property
-    def session_cookie(self):
+    def session_cookie_source(self):
+        """Page issuing session cookie, and cookie name"""
         return None, None
 
     @property
@@ -65,7 +75,11 @@ class UKPSC(API):
 
     def company_detail_url(self, company_data) -> str:
         """API company detail url"""
-        return None
+        if "company_name" in company_data:
+            # Search results already hold the company profile
+            return None
+        company_number = company_data['company_number']
+        return f"https://api.company-information.service.gov.uk/company/{company_number}"
 
     def company_persons_url(self, company_data) -> str:
         """API company detail url"""
@@ -113,6 +127,15 @@ class UKPSC(API):
         """Querying company name extra parameters"""
         return {}
 
+    def company_id_item(self, identifier: str) -> Optional[dict]:
+        """Company item for fetching detail directly by identifier (None if not supported)"""
+        identifier = identifier.strip().upper()
+        return {"company_number": identifier.zfill(8) if identifier.isdigit() else identifier}
+
+    def query_company_id_params(self, identifier: str) -> Optional[dict]:
+        """Querying company identifier parameters (None if not supported)"""
+        return None
+
     def query_company_detail_params(self, company_data) -> dict:
         """Querying company detail parameters"""
         #return {"id": company_data["companyId"]}
@@ -157,7 +180,7 @@ class UKPSC(API):
     def check_result(self, json_data: Union[dict, list], detail=False) -> bool:
         """Check successful return value"""
         if detail:
-            if isinstance(json_data, dict) and "companyName" in json_data:
+            if isinstance(json_data, dict) and "company_number" in json_data:
                 return True
             else:
                 return False
@@ -181,26 +204,34 @@ class UKPSC(API):
         """Extract main data body from json data"""
         return json_data['items']
 
+    def total_count(self, json_data: dict) -> Optional[int]:
+        """Total number of search results, if reported"""
+        if "hits" in json_data:
+            return json_data["hits"]
+        else:
+            return None
+
+    def corporate_owner(self, item: dict) -> Optional[Tuple[str, str, str]]:
+        """Country code, registration number and name of a corporate owner"""
+        if item.get("kind") != "corporate-entity-person-with-significant-control":
+            return None
+        identification = item.get("identification", {})
+        number = identification.get("registration_number")
+        if not number:
+            return None
+        country = identification.get("country_registered") or ""
+        place = identification.get("place_registered") or ""
+        if country.lower() in UK_COUNTRIES or "companies house" in place.lower():
+            number = number.strip().upper()
+            return "GB", number.zfill(8) if number.isdigit() else number, item["name"]
+        try:
+            return pycountry.countries.lookup(country).alpha_2, number.strip(), item["name"]
+        except LookupError:
+            return None
+
     def company_prepocessing(self, data: dict) -> dict:
-        self.pre_processed = {}
-        for section in data["sections"]:
-            section_name = section["nameCode"]
-            #self.pre_processed[section_name] = {}
-            for subdeed in section["subDeeds"]:
-                subdeed_name = subdeed["sectionName"]
-                #self.pre_processed[section_name][subdeed_name] = {}
-                for group in subdeed["groups"]:
-                    group_name = group["nameCode"]
-                    #self.pre_processed[section_name][subdeed_name][group_name] = {}
-                    for field in group["fields"]:
-                        field_name = field["nameCode"]
-                        selector = Selector(text=field["htmlData"])
-                        text = " ".join(selector.xpath('//text()').getall())
-                        latin = self.from_local_characters(text)
-                        #self.pre_processed[section_name][subdeed_name][group_name][field_name] = {'text': text}
-                        self.pre_processed[field_name] = {'text': text, 'date': field["fieldEntryDate"]}
-                        print(f"{field_name}: {latin} {text}")
-        print(self.pre_processed)
+        """Company profiles need no preprocessing"""
+        pass
 
     def extract_type(self, json_data: dict) -> Optional[str]:
         """Extract item type (entity, relationship or exception)"""
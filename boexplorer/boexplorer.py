@@ -6,14 +6,32 @@ import reflex as rx
 from boexplorer import style
 from boexplorer.layout.navbar import navbar
 from boexplorer.state import ExplorerState
-from boexplorer.components.table import summary_table
+from boexplorer.components.table import person_table, summary_table
+from boexplorer.apis import search_companies_apis, search_persons_apis
+from boexplorer.download.browsers import run_browser_pool
+from boexplorer.download.cookies import keep_session_cookies
 
 def details() -> rx.Component:
     # Details Page
-    return rx.container(
-        #rx.text(ExplorerState.detail_identifier)
-        #entity_details()
-    )
+    return rx.fragment(
+               rx.vstack(
+                   navbar(title="Beneficial Ownership Explorer"),
+                   rx.vstack(
+                       rx.heading(ExplorerState.detail_row[0]),
+                       rx.text(f"{ExplorerState.detail_row[1]}, {ExplorerState.detail_identifier}"),
+                       rx.text(f"Sources: {ExplorerState.detail_row[4]}"),
+                       rx.hstack(
+                           rx.text("Individuals", weight="bold"),
+                           rx.cond(ExplorerState.loading_persons, rx.spinner(size="2")),
+                           align="center",
+                       ),
+                       person_table(ExplorerState.detail_person_table),
+                       width="100%",
+                       margin="1em",
+                   ),
+               ),
+               rx.color_mode.button(position="bottom-left"),
+           )
 
 def results() -> rx.Component:
     # Results Page
@@ -34,7 +52,7 @@ def results() -> rx.Component:
                     #)
                     rx.data_editor(
                         columns=ExplorerState.columns,
-                        data=ExplorerState.data_table,
+                        data=ExplorerState.entity_table,
                         on_cell_clicked=ExplorerState.get_detail,
                     )
                 ),
@@ -53,11 +71,18 @@ def company_results() -> rx.Component:
                rx.vstack(
                    navbar(title="Beneficial Ownership Explorer"),
                    rx.vstack(
-                       rx.text(f"Searching for {ExplorerState.search_query}:", margin="1em"),
+                       rx.hstack(
+                           rx.text(f"Searching for {ExplorerState.search_query}:", margin="1em"),
+                           rx.cond(ExplorerState.searching, rx.spinner(size="2")),
+                           rx.cond(ExplorerState.display_table,
+                                   rx.link("Show companies", href="/entities")),
+                           align="center",
+                       ),
                        rx.center(
                            rx.cond(
                                ExplorerState.display_table,
-                               summary_table(ExplorerState.summary_columns, ExplorerState.data_table)
+                               summary_table(ExplorerState.summary_columns, ExplorerState.data_table,
+                                             on_retry=ExplorerState.retry_source)
                            ),
                            width="100%",
                            margin="1em",
@@ -73,11 +98,16 @@ def persons_results() -> rx.Component:
                rx.vstack(
                    navbar(title="Beneficial Ownership Explorer"),
                    rx.vstack(
-                       rx.text(f"Searching for {ExplorerState.search_query}:", margin="1em"),
+                       rx.hstack(
+                           rx.text(f"Searching for {ExplorerState.search_query}:", margin="1em"),
+                           rx.cond(ExplorerState.searching, rx.spinner(size="2")),
+                           align="center",
+                       ),
                        rx.center(
                            rx.cond(
                                ExplorerState.display_table,
-                               summary_table(ExplorerState.summary_columns, ExplorerState.data_table)
+                               summary_table(ExplorerState.summary_columns, ExplorerState.data_table,
+                                             on_retry=ExplorerState.retry_source)
                            ),
                            width="100%",
                            margin="1em",
@@ -96,7 +126,7 @@ def search_bar() -> rx.Component:
             style=style.input_style,
         ),
         rx.radio(
-            ["Company search", "Person search"],
+            ["Company search", "Person search", "Identifier search"],
             default_value="Company search",
             name="search_type",
             required=True,
@@ -173,7 +203,10 @@ def index() -> rx.Component:
            )
 
 app = rx.App()
+app.register_lifespan_task(run_browser_pool)
+app.register_lifespan_task(keep_session_cookies, apis=search_companies_apis + search_persons_apis)
 app.add_page(index, on_load=ExplorerState.initialise_search_page)
-app.add_page(company_results, route="/companies")
-app.add_page(persons_results, route="/persons")
+app.add_page(company_results, route="/companies", on_load=ExplorerState.resume_search)
+app.add_page(persons_results, route="/persons", on_load=ExplorerState.resume_search)
+app.add_page(results, route="/entities")
 app.add_page(details)
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import sys
+import time
+
+from boexplorer.utils.text import normalise_name
+
+
+def read_names(input_file, column=None):
+    """Read names from CSV (named column, or first column)"""
+    if column:
+        return [row[column] for row in csv.DictReader(input_file) if row.get(column)]
+    return [row[0] for row in csv.reader(input_file) if row and row[0].strip()]
+
+def read_checkpoint(checkpoint):
+    """Normalised names already completed in an earlier run"""
+    try:
+        with open(checkpoint, "r") as checkpoint_file:
+            return {line.strip() for line in checkpoint_file if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def bods_statements(bods_data):
+    """All statements in search results"""
+    for section in ("entities", "persons", "relationships"):
+        for statements in bods_data.get(section, {}).values():
+            yield from statements
+
+async def run_search(args):
+    from boexplorer.download.stats import payload_summary
+    from boexplorer.screening import screen
+
+    if args.input == "-":
+        names = read_names(sys.stdin, args.column)
+    else:
+        with open(args.input, "r", newline="") as input_file:
+            names = read_names(input_file, args.column)
+    completed = read_checkpoint(args.checkpoint) if args.checkpoint else set()
+    names = [name for name in names if normalise_name(name) not in completed]
+    sources = args.sources.split(",") if args.sources else None
+    output = open(args.output, "a" if completed else "w") if args.output else sys.stdout
+    checkpoint = open(args.checkpoint, "a") if args.checkpoint else None
+    start = time.monotonic()
+    statement_count = 0
+    result = None
+    try:
+        # Fetching and transforming print progress to stdout, which would corrupt
+        # JSON Lines output, so only statements go to the real stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            async for result in screen(names, kind=args.kind, sources=sources,
+                                       concurrency=args.parallel):
+                count = 0
+                for statement in bods_statements(result.bods_data or {}):
+                    output.write(json.dumps(statement) + "\n")
+                    count += 1
+                output.flush()
+                if checkpoint:
+                    checkpoint.write(normalise_name(result.name) + "\n")
+                    checkpoint.flush()
+                statement_count += count
+                print(f"[{result.completed}/{result.total}] {result.name}: {count} statements "
+                      f"({result.throughput:.2f} names/s)", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if checkpoint:
+            checkpoint.close()
+    elapsed = time.monotonic() - start
+    searched = result.completed if result else 0
+    print(f"Searched {searched} names ({len(completed)} skipped from checkpoint), "
+          f"{statement_count} statements in {elapsed:.1f}s "
+          f"({searched / max(elapsed, 1e-6):.2f} names/s)", file=sys.stderr)
+    for line in payload_summary():
+        print(f"Payloads {line}", file=sys.stderr)
+
+async def run_crawl(args):
+    from boexplorer.apis import search_companies_apis
+    from boexplorer.crawler import crawl_identifier
+    from boexplorer.search import lookup_api
+
+    api = lookup_api(args.source, search_companies_apis)
+    if api is None:
+        sys.exit(f"Unknown source: {args.source}")
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        # Keep debug prints out of JSON Lines output
+        with contextlib.redirect_stdout(sys.stderr):
+            bods_data = await crawl_identifier(api, args.identifier, max_depth=args.max_depth,
+                                               max_nodes=args.max_nodes)
+        if bods_data is None:
+            sys.exit(f"Not found: {args.source}-{args.identifier}")
+        count = 0
+        for statement in bods_statements(bods_data):
+            output.write(json.dumps(statement) + "\n")
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Crawled {len(bods_data['entities'])} entities from {len(bods_data['sources'])} "
+          f"sources, {count} statements", file=sys.stderr)
+
+async def run_worker(args):
+    from boexplorer.jobs import run_worker
+
+    await run_worker(workers=args.workers)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="boexplorer",
+                                     description="Beneficial ownership explorer")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Search for a list of names")
+    search.add_argument("input", nargs="?", default="-",
+                        help="CSV file of names (default: stdin)")
+    search.add_argument("--column", help="CSV column containing names (default: first column)")
+    search.add_argument("--kind", choices=("company", "person"), default="company",
+                        help="Kind of search")
+    search.add_argument("--sources", help="Comma-separated source schemes (default: all)")
+    search.add_argument("--parallel", type=int, help="Names searched at once")
+    search.add_argument("--output", help="JSON Lines output file (default: stdout)")
+    search.add_argument("--checkpoint", help="File recording completed names, to resume runs")
+    search.set_defaults(run=run_search)
+    crawl = commands.add_parser("crawl", help="Follow the corporate owners of an entity")
+    crawl.add_argument("source", help="Source scheme of the entity (e.g. GB-COH)")
+    crawl.add_argument("identifier", help="Identifier of the entity in the source")
+    crawl.add_argument("--max-depth", type=int, help="Levels of ownership followed")
+    crawl.add_argument("--max-nodes", type=int, help="Maximum entities crawled")
+    crawl.add_argument("--output", help="JSON Lines output file (default: stdout)")
+    crawl.set_defaults(run=run_crawl)
+    worker = commands.add_parser("worker", help="Run queued search jobs")
+    worker.add_argument("--workers", type=int, help="Jobs run at once")
+    worker.set_defaults(run=run_worker)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    asyncio.run(args.run(args))
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,23 @@ def summary_table_header(columns: List[str]):
             ),
         )
 
-def summary_table_row(row: List[str]):
+def summary_table_status(row: List[str], on_retry=None):
+    """Show source status, with retry for incomplete sources and loading for probed ones."""
+    if on_retry is None:
+        return rx.table.cell(row[5])
+    return rx.table.cell(
+        rx.cond(
+            row[5] == "incomplete",
+            rx.button("Retry", size="1", on_click=on_retry(row[6])),
+            rx.cond(
+                row[5] == "probed",
+                rx.button("Load results", size="1", on_click=on_retry(row[6])),
+                rx.text(row[5]),
+            ),
+        )
+    )
+
+def summary_table_row(row: List[str], on_retry=None):
     """Show table row."""
     return rx.table.row(
         rx.table.cell(row[0]),
@@ -26,14 +42,37 @@ def summary_table_row(row: List[str]):
         rx.table.cell(row[2]),
         rx.table.cell(row[3]),
         rx.table.cell(rx.link(f"Search {row[1]}", href=row[4])),
+        summary_table_status(row, on_retry=on_retry),
     )
 
-def summary_table(columns: List[str], rows: List[List[str]]):
+def summary_table(columns: List[str], rows: List[List[str]], on_retry=None):
     return rx.table.root(
         summary_table_header(columns),
         rx.table.body(
             rx.foreach(
-                rows, summary_table_row
+                rows, lambda row: summary_table_row(row, on_retry=on_retry)
+            )
+        ),
+        width="100%",
+    )
+
+def person_table(rows: List[List[str]]):
+    """Table of persons' name, birth date and source."""
+    return rx.table.root(
+        rx.table.header(
+            rx.table.row(
+                rx.table.column_header_cell("Name"),
+                rx.table.column_header_cell("Born"),
+                rx.table.column_header_cell("Source"),
+            ),
+        ),
+        rx.table.body(
+            rx.foreach(
+                rows, lambda row: rx.table.row(
+                    rx.table.cell(row[0]),
+                    rx.table.cell(row[1]),
+                    rx.table.cell(row[2]),
+                )
             )
         ),
         width="100%",
@@ -0,0 +1,184 @@
+import asyncio
+
+from boexplorer.apis import search_companies_apis
+from boexplorer.config import app_config
+from boexplorer.download.caching import cache_init
+from boexplorer.download.cookies import session_cookie
+from boexplorer.download.plan import source_plan
+from boexplorer.executor import run_cpu
+from boexplorer.query.name import build_company_name_query
+from boexplorer.search import (RequestRejected, add_source, hydrate_entity, iter_search_pages,
+                               lookup_company_id, match_records, record_identifiers,
+                               transform_company_data)
+from boexplorer.transforms.bods_0_4_0 import transform_ownership
+
+
+def crawl_budget():
+    """Configured maximum depth and number of entities for ownership crawls"""
+    config = app_config.get("crawler", {})
+    return config.get("max_depth", 3), config.get("max_nodes", 50)
+
+def owner_api(country, apis):
+    """Company register api for country"""
+    for api in apis:
+        if api.scheme.split('-')[0] == country:
+            return api
+    return None
+
+def matches_identifier(api, item, identifier):
+    try:
+        return str(api.identifier(item)) == str(identifier)
+    except (KeyError, TypeError):
+        return False
+
+class OwnershipCrawler:
+    """Expand the ownership graph of an entity breadth-first, following corporate owners
+    onto their own registers"""
+
+    def __init__(self, bods_data=None, max_depth=None, max_nodes=None, apis=None):
+        depth, nodes = crawl_budget()
+        self.max_depth = depth if max_depth is None else max_depth
+        self.max_nodes = nodes if max_nodes is None else max_nodes
+        self.apis = search_companies_apis if apis is None else apis
+        if bods_data is None:
+            bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+        self.bods_data = bods_data
+        self.visited = set()
+        # Crawled entities' recordIds, by scheme and identifier, to link owners to
+        self.record_ids = {}
+        # Corporate owners found: (api, person item, owned entity recordId, owner)
+        self.owned = []
+        self.counters = {}
+        self.headers = {}
+        self.cache = None
+
+    async def header(self, api):
+        if api.scheme not in self.headers:
+            user_agent, cookie = await session_cookie(api)
+            self.headers[api.scheme] = source_plan(api).header(user_agent, cookie)
+        return self.headers[api.scheme]
+
+    async def resolve(self, api, identifier, name):
+        """Find corporate owner on its register by identifier (or by name, matching identifier)"""
+        items = await lookup_company_id(api, identifier, await self.header(api), self.cache)
+        if items:
+            return api, items[0]
+        pages = iter_search_pages(api, source_plan(api), build_company_name_query, name,
+                                  "company_search", await self.header(api), self.cache,
+                                  max_results=20)
+        try:
+            async for data in pages:
+                for item in data:
+                    if matches_identifier(api, item, identifier):
+                        return api, item
+        except RequestRejected:
+            pass
+        finally:
+            await pages.aclose()
+        print(f"Could not resolve owner {name} ({api.scheme}-{identifier})")
+        return None
+
+    async def expand(self, api, entity):
+        """Fetch, transform and merge an entity, returning its corporate owners"""
+        hydrated = await hydrate_entity(api, entity, await self.header(api), self.cache)
+        if hydrated is None:
+            return []
+        entity, persons = hydrated
+        detail = source_plan(api).requests["company_detail"].enabled
+        entities, person_statements = await run_cpu(transform_company_data, api, [entity],
+                                                    persons, None, detail)
+        _, entity_ids, person_ids = self.counters.setdefault(api.scheme, (api, {}, {}))
+        match_records(entities, self.bods_data['entities'], entity_ids)
+        match_records(person_statements, self.bods_data['persons'], person_ids)
+        await record_identifiers(entities)
+        return self.corporate_owners(api, entity, persons)
+
+    def corporate_owners(self, api, entity, persons):
+        """Corporate owners among an entity's persons, noting which entity they own"""
+        owners = []
+        for person in persons:
+            owner = api.corporate_owner(person)
+            if owner:
+                owners.append(owner)
+                self.owned.append((api, person, api.record_id(entity), owner))
+        return owners
+
+    def unvisited(self, owners):
+        """Owners not yet crawled, within the node budget"""
+        for country, identifier, name in owners:
+            api = owner_api(country, self.apis)
+            if api is None:
+                continue
+            record_id = f"{api.scheme}-{identifier}"
+            if record_id in self.visited or len(self.visited) >= self.max_nodes:
+                continue
+            self.visited.add(record_id)
+            yield api, identifier, name
+
+    def link_owners(self):
+        """Merge relationships from each crawled entity to its crawled corporate owners"""
+        statements = []
+        for api, person, record_id, (country, identifier, _) in self.owned:
+            owner = owner_api(country, self.apis)
+            owner_id = owner and self.record_ids.get(f"{owner.scheme}-{identifier}")
+            if owner_id:
+                statements.append(transform_ownership(person, api, record_id, owner_id))
+        match_records(statements, self.bods_data.setdefault('relationships', {}))
+
+    async def crawl(self, api, entity):
+        """Crawl ownership of entity, returning the merged BODS data"""
+        self.cache = cache_init(app_config["caching"]["cache_dir"])
+        try:
+            self.visited.add(api.record_id(entity))
+            self.record_ids[api.record_id(entity)] = api.record_id(entity)
+            frontier = [(api, entity)]
+            depth = 0
+            while frontier:
+                # Expand the whole frontier concurrently (bounded by per-source limiters)
+                expanded = await asyncio.gather(*[self.expand(node_api, node)
+                                                  for node_api, node in frontier],
+                                                return_exceptions=True)
+                owners = []
+                for (node_api, _), result in zip(frontier, expanded):
+                    if isinstance(result, Exception):
+                        print(f"Crawl failed for {node_api.scheme}: {result!r}")
+                    else:
+                        owners.extend(result)
+                depth += 1
+                if depth > self.max_depth:
+                    break
+                pending = list(self.unvisited(owners))
+                resolved = await asyncio.gather(*[self.resolve(*owner) for owner in pending],
+                                                return_exceptions=True)
+                frontier = []
+                for (register, identifier, _), node in zip(pending, resolved):
+                    if node and not isinstance(node, Exception):
+                        key = f"{register.scheme}-{identifier}"
+                        self.record_ids[key] = node[0].record_id(node[1])
+                        frontier.append(node)
+            self.link_owners()
+            for source_api, entity_ids, person_ids in self.counters.values():
+                add_source(source_api, self.bods_data['sources'], len(entity_ids), len(person_ids))
+            return self.bods_data
+        finally:
+            self.cache.close()
+
+async def crawl_ownership(api, entity, bods_data=None, max_depth=None, max_nodes=None):
+    """Crawl the ownership chain of an entity from a company search"""
+    crawler = OwnershipCrawler(bods_data=bods_data, max_depth=max_depth, max_nodes=max_nodes)
+    return await crawler.crawl(api, entity)
+
+async def crawl_identifier(api, identifier, max_depth=None, max_nodes=None):
+    """Crawl the ownership chain of the entity with identifier on api's register
+    (None if the entity isn't found)"""
+    crawler = OwnershipCrawler(max_depth=max_depth, max_nodes=max_nodes)
+    cache = cache_init(app_config["caching"]["cache_dir"])
+    try:
+        items = await lookup_company_id(api, identifier, await crawler.header(api), cache)
+    finally:
+        cache.close()
+    if not items:
+        return None
+    bods_data = await crawler.crawl(api, items[0])
+    # Identifiers looked up directly aren't known to exist until their detail is fetched
+    return bods_data if bods_data['entities'] else None
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from diskcache import Cache
+
+from boexplorer.config import app_config
+
+
+class IdentifierCrosswalk:
+    """Persisted index of identifiers seen for the same entity (e.g. LEI and national ids)"""
+
+    def __init__(self, directory):
+        self.cache = Cache(directory)
+
+    def add(self, identifiers):
+        """Link (scheme, id) pairs that identify the same entity"""
+        identifiers = set(identifiers)
+        with self.cache.transact():
+            for identifier in identifiers:
+                linked = set(self.cache.get(identifier, ()))
+                updated = linked | (identifiers - {identifier})
+                if updated != linked:
+                    self.cache.set(identifier, tuple(sorted(updated)))
+
+    def linked(self, scheme, identifier):
+        """(scheme, id) pairs linked to identifier"""
+        return list(self.cache.get((scheme, str(identifier)), ()))
+
+    def record_statements(self, statements):
+        """Link identifiers listed together in entity statements"""
+        for statement in statements:
+            details = statement.get("recordDetails", {})
+            identifiers = [(item["scheme"], str(item["id"])) for item in details.get("identifiers", [])
+                           if item.get("scheme") and item.get("id")]
+            if len(identifiers) > 1:
+                self.add(identifiers)
+
+    def close(self):
+        self.cache.close()
+
+_crosswalk = None
+
+def crosswalk():
+    """Shared identifier crosswalk (created on first use)"""
+    global _crosswalk
+    if _crosswalk is None:
+        _crosswalk = IdentifierCrosswalk(Path(app_config["caching"]["cache_dir"]) / "crosswalk")
+    return _crosswalk
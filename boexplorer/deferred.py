@@ -0,0 +1,81 @@
+import asyncio
+import weakref
+from pathlib import Path
+
+from diskcache import Cache
+
+from boexplorer.config import app_config
+
+
+class DeferredPersons:
+    """Persisted source items of entities whose persons are fetched when the entity is opened"""
+
+    def __init__(self, directory, ttl=86400):
+        self.cache = Cache(directory)
+        self.ttl = ttl
+
+    def defer(self, scheme, items, text=None):
+        """Keep (record_id, entity item) pairs from a source until their persons are needed"""
+        with self.cache.transact():
+            for record_id, item in items:
+                sources = self.cache.get(("deferred", record_id), {})
+                if scheme not in sources:
+                    # Cached persons don't cover this source yet
+                    self.cache.delete(("persons", record_id))
+                sources[scheme] = {"item": item, "text": text}
+                self.cache.set(("deferred", record_id), sources, expire=self.ttl)
+
+    def sources(self, record_id):
+        """Deferred entity items (and search text) of record_id, by source scheme"""
+        return self.cache.get(("deferred", record_id), {})
+
+    def persons(self, record_id):
+        """Cached person statements of record_id (None if not fetched yet)"""
+        return self.cache.get(("persons", record_id))
+
+    def set_persons(self, record_id, statements):
+        self.cache.set(("persons", record_id), statements, expire=self.ttl)
+
+    def close(self):
+        self.cache.close()
+
+_deferred = None
+
+def deferred_persons():
+    """Shared store of deferred persons (created on first use)"""
+    global _deferred
+    if _deferred is None:
+        config = app_config.get("search", {})
+        _deferred = DeferredPersons(Path(app_config["caching"]["cache_dir"]) / "deferred-persons",
+                                    ttl=config.get("persons_ttl", 86400))
+    return _deferred
+
+def defer_persons_enabled():
+    """Whether the web app fetches persons when an entity is opened, rather than during searches"""
+    return app_config.get("search", {}).get("defer_persons", True)
+
+# Tasks are bound to an event loop, so keep in-flight fetches per running loop
+_pending = weakref.WeakKeyDictionary()
+
+async def single_flight(key, fetch):
+    """Await fetch(), sharing one in-flight call between concurrent callers with the same key.
+
+    The call is cancelled once every caller waiting for it has been cancelled."""
+    pending = _pending.setdefault(asyncio.get_running_loop(), {})
+    flight = pending.get(key)
+    if flight is None:
+        flight = pending[key] = [asyncio.create_task(fetch()), 0]
+        # A later call with the same key may have replaced a cancelled flight
+        flight[0].add_done_callback(lambda _: pending.pop(key, None)
+                                    if pending.get(key) is flight else None)
+    flight[1] += 1
+    try:
+        # Shared by concurrent callers, so one caller cancelling must not cancel it
+        return await asyncio.shield(flight[0])
+    finally:
+        flight[1] -= 1
+        if not flight[1] and not flight[0].done():
+            # New callers start a fresh call rather than joining the cancelled one
+            if pending.get(key) is flight:
+                del pending[key]
+            flight[0].cancel()
@@ -13,17 +13,28 @@ def merge_records(record_id, records):
     founding_date = records[0]["recordDetails"]["foundingDate"]
     return [name, jurisdiction, record_id, not_none(founding_date), list_all(records)]
 
+def person_name(statement):
+    names = statement["recordDetails"].get("names")
+    return names[0].get("fullName", "") if names else "Unknown person"
+
+def construct_person_table(persons):
+    """Rows of name, birth date and source of person statements"""
+    return [[person_name(statement), not_none(statement["recordDetails"].get("birthDate")),
+             statement["source"]["description"]] for statement in persons]
+
 def summary_columns(table_type="company"):
     if table_type == "person":
-        return ["Country", "Source", "Individuals", "Companies", "Links"]
+        return ["Country", "Source", "Individuals", "Companies", "Links", "Status"]
     else:
-        return ["Country", "Source", "Companies", "Individuals", "Links"]
+        return ["Country", "Source", "Companies", "Individuals", "Links", "Status"]
 
 def source_summary(source_id, data, table_type="company"):
     if table_type == "person":
-        return [data['country'], data['name'], data['person_count'], data['entity_count'], data['url']]
+        return [data['country'], data['name'], data['person_count'], data['entity_count'], data['url'],
+                data['status'], source_id]
     else:
-        return [data['country'], data['name'], data['entity_count'], data['person_count'], data['url']]
+        return [data['country'], data['name'], data['entity_count'], data['person_count'], data['url'],
+                data['status'], source_id]
 
 def construct_company_table(bods_data):
     table = []
@@ -1,17 +1,81 @@
+import asyncio
+import base64
 import httpx
 import json
+import time
+from dataclasses import dataclass
 
-def authenticate(auth_url, client_id, client_secret):
-    print("Authenticating:", {"username": client_id, "password": client_secret})
-    r = httpx.post(auth_url, json={"username": client_id, "password": client_secret}, timeout=15)
+@dataclass(frozen=True)
+class BearerCredentials:
+    """Credentials exchanged for a bearer token on first use"""
+    auth_url: str
+    username: str
+    password: str
+
+async def authenticate_async(auth_url, client_id, client_secret):
+    print("Authenticating:", auth_url, client_id)
+    async with httpx.AsyncClient() as client:
+        r = await client.post(auth_url, json={"username": client_id, "password": client_secret}, timeout=15)
     json_data = r.json()
-    #print(json.dumps(json_data))
     return json_data['token']
 
+def token_expiry(token, default_ttl):
+    """Expiry time of token, from its JWT exp claim if it has one"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + default_ttl
+
+class TokenManager:
+    """Caches bearer tokens per source, refreshing them ahead of expiry"""
+    def __init__(self, refresh_margin=120, default_ttl=3600):
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.tokens = {}
+        self.refreshing = {}
+
+    def _refresh(self, credentials):
+        """Fetch a new token, sharing one login between concurrent callers"""
+        if credentials not in self.refreshing:
+            task = asyncio.create_task(self._login(credentials))
+            task.add_done_callback(lambda done: self.refreshing.pop(credentials, None))
+            self.refreshing[credentials] = task
+        return self.refreshing[credentials]
+
+    async def _login(self, credentials):
+        token = await authenticate_async(credentials.auth_url, credentials.username,
+                                         credentials.password)
+        self.tokens[credentials] = (token, token_expiry(token, self.default_ttl))
+        return token
+
+    async def token(self, credentials):
+        """Current token for credentials"""
+        if credentials in self.tokens:
+            token, expiry = self.tokens[credentials]
+            remaining = expiry - time.time()
+            if remaining > 0:
+                if remaining < self.refresh_margin:
+                    self._refresh(credentials)
+                return token
+        return await asyncio.shield(self._refresh(credentials))
+
+    async def rejected(self, credentials, token):
+        """Replace a token the source rejected (unless already replaced)"""
+        if credentials in self.tokens and self.tokens[credentials][0] == token:
+            del self.tokens[credentials]
+        return await self.token(credentials)
+
+    async def auth_header(self, credentials):
+        return {'Authorization': f'Bearer {await self.token(credentials)}'}
+
+token_manager = TokenManager()
+
 def authenticator(username="", password="", auth_type="basic", auth_url=None):
     if auth_type == "basic":
         return httpx.BasicAuth(username=username, password=password)
     elif auth_type == "bearer":
-        token = authenticate(auth_url, username, password)
-        return {'Authorization': f'Bearer {token}'}
+        # Token is obtained (and cached) by token_manager when a request is made
+        return BearerCredentials(auth_url, username, password)
     return None
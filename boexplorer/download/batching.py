@@ -0,0 +1,102 @@
+import asyncio
+import weakref
+from pathlib import Path
+
+from boexplorer.config import app_config
+from boexplorer.download.caching import cache_init
+from boexplorer.download.limits import limited, source_limiter
+from boexplorer.download.plan import source_plan
+from boexplorer.query.name import build_company_search_query
+
+
+class LEIBatcher:
+    """Coalesce LEI record lookups into batched GLEIF requests, caching each record"""
+
+    def __init__(self, api, cache, ttl=86400, window=0.01):
+        self.api = api
+        self.cache = cache
+        self.ttl = ttl
+        self.window = window
+        self.pending = {}
+        self.queued = []
+        self.scheduled = None
+        self.tasks = set()
+
+    async def get(self, lei):
+        """LEI record (None if GLEIF has no record)"""
+        lei = lei.strip().upper()
+        record = self.cache.get(("lei-record", lei))
+        if record is not None:
+            return record
+        if lei not in self.pending:
+            # Queue for the next batch, sent once it is full or after a short window
+            self.pending[lei] = asyncio.get_running_loop().create_future()
+            self.queued.append(lei)
+            if len(self.queued) >= self.api.lei_batch_size:
+                self.flush()
+            elif self.scheduled is None:
+                self.scheduled = asyncio.get_running_loop().call_later(self.window, self.flush)
+        # Shared by concurrent callers, so one caller cancelling must not cancel it
+        return await asyncio.shield(self.pending[lei])
+
+    async def get_many(self, leis):
+        """LEI records by LEI"""
+        records = await asyncio.gather(*[self.get(lei) for lei in leis])
+        return dict(zip(leis, records))
+
+    def flush(self):
+        """Send queued LEIs in batches"""
+        if self.scheduled is not None:
+            self.scheduled.cancel()
+            self.scheduled = None
+        size = self.api.lei_batch_size
+        while self.queued:
+            batch, self.queued = self.queued[:size], self.queued[size:]
+            task = asyncio.create_task(self.fetch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def fetch(self, batch):
+        plan = source_plan(self.api)
+        try:
+            url, query_params, other_params = build_company_search_query(
+                self.api, self.api.query_lei_batch_params(batch), page_size=len(batch))
+            json_data = await limited(source_limiter(self.api),
+                                      plan.download("company_search", url, query_params,
+                                                    other_params))
+            records = {}
+            if plan.check_result(json_data):
+                for item in plan.extract_data(json_data):
+                    records[item["attributes"]["lei"]] = item
+            for lei in batch:
+                record = records.get(lei)
+                if record is not None:
+                    self.cache.set(("lei-record", lei), record, expire=self.ttl)
+                self.pending.pop(lei).set_result(record)
+        except Exception as exception:
+            for lei in batch:
+                future = self.pending.pop(lei, None)
+                if future is not None and not future.done():
+                    future.set_exception(exception)
+        finally:
+            # Cancelled while fetching, so release any waiting callers
+            for lei in batch:
+                future = self.pending.pop(lei, None)
+                if future is not None and not future.done():
+                    future.cancel()
+
+# Futures are bound to an event loop, so keep one batcher per running loop
+_batchers = weakref.WeakKeyDictionary()
+_cache = None
+
+def lei_batcher(api):
+    """Shared LEI batcher for GLEIF api"""
+    global _cache
+    loop = asyncio.get_running_loop()
+    if loop not in _batchers:
+        if _cache is None:
+            _cache = cache_init(Path(app_config["caching"]["cache_dir"]) / "lei-records")
+        config = app_config.get("gleif", {})
+        _batchers[loop] = LEIBatcher(api, _cache, ttl=config.get("record_ttl", 86400),
+                                     window=config.get("batch_window", 0.01))
+    return _batchers[loop]
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import psutil
+
+from boexplorer.config import app_config
+from boexplorer.download.stealth import create_stealth_driver, extract_cookie, fetch_cookies
+from boexplorer.download.utils import get_random_user_agent
+
+class PooledDriver:
+    """Stealth driver with its usage history"""
+    def __init__(self, driver, user_agent):
+        self.driver = driver
+        self.user_agent = user_agent
+        self.created = time.monotonic()
+        self.pages = 0
+
+    def healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def memory(self):
+        """Resident memory of driver and browser processes (bytes)"""
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [process] + process.children(recursive=True))
+        except (AttributeError, psutil.Error):
+            return 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as exception:
+            print(f"Error quitting driver: {exception!r}")
+
+class DriverPool:
+    """Pool of pre-started stealth drivers, recycled by age, page count and memory"""
+    def __init__(self, size=2, max_lifetime=1800, max_pages=50, memory_limit_mb=1500, warm=1):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.max_pages = max_pages
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.warm = warm
+        self.idle = []
+        self.drivers = set()
+        self.starting = 0
+        self._condition = None
+
+    @property
+    def condition(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _expired(self, pooled):
+        return (time.monotonic() - pooled.created > self.max_lifetime or
+                pooled.pages >= self.max_pages)
+
+    def _memory(self):
+        return sum(pooled.memory() for pooled in self.drivers)
+
+    async def _create(self):
+        user_agent = get_random_user_agent()
+        driver = await asyncio.to_thread(create_stealth_driver, user_agent)
+        return PooledDriver(driver, user_agent)
+
+    async def _discard(self, pooled):
+        self.drivers.discard(pooled)
+        await asyncio.to_thread(pooled.quit)
+
+    async def start(self):
+        """Pre-start warm drivers"""
+        while len(self.drivers) + self.starting < min(self.warm, self.size):
+            self.starting += 1
+            try:
+                pooled = await self._create()
+            finally:
+                self.starting -= 1
+            async with self.condition:
+                self.drivers.add(pooled)
+                self.idle.append(pooled)
+                self.condition.notify()
+
+    async def checkout(self):
+        """Take an idle driver, starting one if the pool has room"""
+        while True:
+            async with self.condition:
+                while not self.idle and (len(self.drivers) + self.starting >= self.size or
+                                         self._memory() >= self.memory_limit):
+                    await self.condition.wait()
+                pooled = self.idle.pop() if self.idle else None
+                if pooled is None:
+                    self.starting += 1
+            if pooled is None:
+                try:
+                    pooled = await self._create()
+                except BaseException:
+                    async with self.condition:
+                        self.starting -= 1
+                        self.condition.notify()
+                    raise
+                async with self.condition:
+                    self.starting -= 1
+                    self.drivers.add(pooled)
+                return pooled
+            if self._expired(pooled) or not await asyncio.to_thread(pooled.healthy):
+                await self._discard(pooled)
+                continue
+            return pooled
+
+    async def checkin(self, pooled, failed=False):
+        """Return driver to pool, quitting it if spent or over the memory cap"""
+        pooled.pages += 1
+        if failed or self._expired(pooled) or self._memory() > self.memory_limit:
+            await self._discard(pooled)
+        async with self.condition:
+            if pooled in self.drivers:
+                self.idle.append(pooled)
+            self.condition.notify()
+
+    @asynccontextmanager
+    async def driver(self):
+        pooled = await self.checkout()
+        failed = True
+        try:
+            yield pooled
+            failed = False
+        finally:
+            await self.checkin(pooled, failed=failed)
+
+    async def run(self, function, *args):
+        """Run blocking driver work in a thread with a pooled driver"""
+        async with self.driver() as pooled:
+            return await asyncio.to_thread(function, pooled.driver, *args)
+
+    async def close(self):
+        async with self.condition:
+            drivers = list(self.drivers)
+            self.idle = []
+            self.drivers = set()
+        for pooled in drivers:
+            await asyncio.to_thread(pooled.quit)
+
+_browser_pool = None
+
+def browser_pool():
+    """Shared browser pool (created on first use)"""
+    global _browser_pool
+    if _browser_pool is None:
+        config = app_config.get("browsers", {})
+        _browser_pool = DriverPool(size=config.get("size", 2),
+                                   max_lifetime=config.get("max_lifetime", 1800),
+                                   max_pages=config.get("max_pages", 50),
+                                   memory_limit_mb=config.get("memory_limit_mb", 1500),
+                                   warm=config.get("warm", 1))
+    return _browser_pool
+
+def driver_session_cookie(driver, url, cookie_name):
+    """User agent and named session cookie issued by url"""
+    driver.delete_all_cookies()
+    cookies = fetch_cookies(driver, url)
+    user_agent = driver.execute_script("return navigator.userAgent")
+    return user_agent, extract_cookie(cookies, cookie_name)
+
+async def session_cookie(url, cookie_name):
+    return await browser_pool().run(driver_session_cookie, url, cookie_name)
+
+async def run_browser_pool():
+    """Keep warm drivers running for the lifetime of the app"""
+    pool = browser_pool()
+    try:
+        await pool.start()
+    except Exception as exception:
+        print(f"Unable to start browser pool: {exception!r}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.close()
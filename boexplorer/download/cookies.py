@@ -0,0 +1,86 @@
+import asyncio
+import time
+from pathlib import Path
+
+from diskcache import Cache
+
+from boexplorer.config import app_config
+from boexplorer.download import browsers
+
+class CookieJar:
+    """Session cookies (with the user agent that obtained them) shared on disk with a TTL"""
+    def __init__(self, directory, ttl=1800, refresh_margin=300):
+        self.cache = Cache(directory)
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.refreshing = {}
+
+    def _key(self, url, cookie_name):
+        return f"{url}|{cookie_name}"
+
+    def _refresh(self, url, cookie_name):
+        """Obtain a new cookie from the browser, sharing one fetch between callers"""
+        key = self._key(url, cookie_name)
+        if key not in self.refreshing:
+            task = asyncio.create_task(self._fetch(url, cookie_name))
+            task.add_done_callback(lambda done: self.refreshing.pop(key, None))
+            self.refreshing[key] = task
+        return self.refreshing[key]
+
+    async def _fetch(self, url, cookie_name):
+        user_agent, cookie = await browsers.session_cookie(url, cookie_name)
+        if cookie:
+            self.cache.set(self._key(url, cookie_name), (user_agent, cookie, time.time() + self.ttl),
+                           expire=self.ttl)
+        return user_agent, cookie
+
+    async def get(self, url, cookie_name):
+        """User agent and session cookie, from the jar if still valid"""
+        entry = self.cache.get(self._key(url, cookie_name))
+        if entry:
+            user_agent, cookie, expiry = entry
+            if expiry - time.time() < self.refresh_margin:
+                self._refresh(url, cookie_name)
+            return user_agent, cookie
+        return await asyncio.shield(self._refresh(url, cookie_name))
+
+    def reject(self, url, cookie_name, cookie):
+        """Drop a cookie the source rejected (unless already replaced)"""
+        key = self._key(url, cookie_name)
+        entry = self.cache.get(key)
+        if entry and entry[1] == cookie:
+            self.cache.delete(key)
+
+_cookie_jar = None
+
+def cookie_jar():
+    """Shared cookie jar (created on first use)"""
+    global _cookie_jar
+    if _cookie_jar is None:
+        config = app_config.get("cookies", {})
+        _cookie_jar = CookieJar(Path(app_config["caching"]["cache_dir"]) / "cookies",
+                                ttl=config.get("ttl", 1800),
+                                refresh_margin=config.get("refresh_margin", 300))
+    return _cookie_jar
+
+async def session_cookie(api):
+    """User agent and session cookie for cookie-gated sources"""
+    url, cookie_name = api.session_cookie_source
+    if not url:
+        return None, None
+    return await cookie_jar().get(url, cookie_name)
+
+def reject_session_cookie(api, cookie):
+    url, cookie_name = api.session_cookie_source
+    if url and cookie:
+        cookie_jar().reject(url, cookie_name, cookie)
+
+async def keep_session_cookies(apis):
+    """Keep cookies for cookie-gated sources fresh, so searches never wait on a browser"""
+    while True:
+        for api in apis:
+            try:
+                await session_cookie(api)
+            except Exception as exception:
+                print(f"Session cookie refresh failed for {api.scheme}: {exception!r}")
+        await asyncio.sleep(cookie_jar().refresh_margin / 2)
@@ -0,0 +1,22 @@
+import asyncio
+import weakref
+
+# Semaphores are bound to an event loop, so keep one set per running loop
+_limiters = weakref.WeakKeyDictionary()
+
+def source_limiter(api):
+    """Shared semaphore bounding concurrent requests to a source"""
+    loop = asyncio.get_running_loop()
+    limiters = _limiters.setdefault(loop, {})
+    if api.scheme not in limiters:
+        limiters[api.scheme] = asyncio.Semaphore(api.http_concurrency)
+    return limiters[api.scheme]
+
+async def limited(limiter, coroutine):
+    """Run coroutine once limiter has a free slot"""
+    async with limiter:
+        return await coroutine
+
+async def gather_limited(limiter, coroutines):
+    """Run coroutines concurrently within limiter, returning results in order"""
+    return await asyncio.gather(*[limited(limiter, coroutine) for coroutine in coroutines])
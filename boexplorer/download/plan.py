@@ -0,0 +1,107 @@
+import weakref
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+from boexplorer.download.authentication import BearerCredentials, token_manager
+from boexplorer.download.query import download_json
+
+REQUEST_TYPES = ("company_search", "company_detail", "company_persons", "person_search", "person_detail")
+
+@dataclass(frozen=True)
+class RequestPlan:
+    """How to issue one type of request to a source"""
+    post: Optional[bool]
+    json_data: Optional[bool]
+    post_pagination: bool
+    timeout: int
+    verify: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        """Source supports this request type"""
+        return self.post is not None
+
+    async def download(self, url, query_params, other_params, header=None, auth=None, cache=None):
+        """Execute request"""
+        reauthenticate = None
+        if isinstance(auth, BearerCredentials):
+            credentials = auth
+            auth = await token_manager.auth_header(credentials)
+            rejected = auth['Authorization'].split(" ", 1)[-1]
+
+            async def reauthenticate():
+                token = await token_manager.rejected(credentials, rejected)
+                return {'Authorization': f'Bearer {token}'}
+        return await download_json(url, query_params, other_params,
+                                   post=self.post,
+                                   post_pagination=self.post_pagination,
+                                   post_json=isinstance(query_params, dict),
+                                   json_data=self.json_data,
+                                   header=header,
+                                   auth=auth,
+                                   verify=self.verify,
+                                   timeout=self.timeout,
+                                   cache=cache,
+                                   reauthenticate=reauthenticate)
+
+@dataclass(frozen=True)
+class SourcePlan:
+    """Request plan compiled once per source"""
+    scheme: str
+    headers: MappingProxyType
+    auth: Any
+    requests: MappingProxyType
+    check_result: Callable
+    extract_data: Callable
+    total_count: Callable
+
+    def header(self, user_agent=None, cookie=None):
+        """Request headers for a search, including any session cookie"""
+        header = dict(self.headers)
+        if user_agent: header["User-Agent"] = user_agent
+        if cookie: header["Cookie"] = cookie
+        return header
+
+    async def download(self, request_type, url, query_params, other_params, header=None, cache=None):
+        """Execute request of the given type"""
+        return await self.requests[request_type].download(url, query_params, other_params,
+                                                          header=header, auth=self.auth, cache=cache)
+
+def compile_auth(authenticator):
+    """Auth passed to http client (credentials embedded in requests are not)"""
+    if isinstance(authenticator, dict) and 'Authorization' not in authenticator:
+        return None
+    return authenticator
+
+def compile_plan(api):
+    """Compile source request plan from api adapter properties"""
+    http_post = api.http_post
+    return_json = api.return_json
+    requests = {}
+    for request_type in REQUEST_TYPES:
+        detail = request_type.endswith("_detail")
+        requests[request_type] = RequestPlan(post=http_post[request_type],
+                                             json_data=True if detail else return_json[request_type],
+                                             post_pagination=False if detail else api.post_pagination,
+                                             timeout=api.http_timeout,
+                                             verify=False if request_type == "company_persons" else True)
+    return SourcePlan(scheme=api.scheme,
+                      headers=MappingProxyType(dict(api.http_headers or {})),
+                      auth=compile_auth(api.authenticator),
+                      requests=MappingProxyType(requests),
+                      check_result=api.check_result,
+                      extract_data=api.extract_data,
+                      total_count=api.total_count)
+
+_plans = weakref.WeakKeyDictionary()
+
+def source_plan(api):
+    """Compiled request plan for source (compiled on first use)"""
+    if api not in _plans:
+        _plans[api] = compile_plan(api)
+    return _plans[api]
+
+def compile_plans(apis):
+    """Compile request plans for sources up front"""
+    return [source_plan(api) for api in apis]
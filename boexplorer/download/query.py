@@ -1,12 +1,14 @@
 import asyncio
 import json
 import logging
+import time
 
 import httpx
 from parsel import Selector
 
 from boexplorer.download.utils import get_random_user_agent
 from boexplorer.download.caching import write_cache, read_cache, build_cache_key
+from boexplorer.download.stats import record_payload
 
 logging.basicConfig(
     format="%(levelname)s [%(asctime)s] %(name)s - %(message)s",
@@ -28,7 +30,7 @@ async def save_cache(cache, key, data):
 
 async def download_json(api_url, query_params, other_params, json_data=True, auth=None,
                   post=False, post_json=True, post_pagination=False, header=None, random_ua=True,
-                  verify=True, return_header=False, timeout=15, cache=None):
+                  verify=True, return_header=False, timeout=15, cache=None, reauthenticate=None):
     if json_data:
         headers = {"Accept": "application/json",
                    "Content-Type": "application/json"}
@@ -102,10 +104,20 @@ async def download_json(api_url, query_params, other_params, json_data=True, aut
         await client.aclose()
     #print(response)
     print(cache, key)
+    if response is not None and response.status_code == 401 and reauthenticate:
+        # Retry once with fresh credentials
+        return await download_json(api_url, query_params, other_params, json_data=json_data,
+                                   auth=await reauthenticate(), post=post, post_json=post_json,
+                                   post_pagination=post_pagination, header=header,
+                                   random_ua=random_ua, verify=verify, return_header=return_header,
+                                   timeout=timeout, cache=cache)
     if response and response.status_code == 200:
         if json_data:
             try:
-                return await save_cache(cache, key, response.json())
+                start = time.perf_counter()
+                data = response.json()
+                record_payload(api_url, len(response.content), time.perf_counter() - start)
+                return await save_cache(cache, key, data)
             except json.decoder.JSONDecodeError:
                 return []
         else:
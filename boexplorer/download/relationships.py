@@ -0,0 +1,76 @@
+import asyncio
+import weakref
+from pathlib import Path
+
+from boexplorer.config import app_config
+from boexplorer.download.batching import lei_batcher
+from boexplorer.download.caching import cache_init
+from boexplorer.download.limits import limited, source_limiter
+from boexplorer.download.plan import source_plan
+
+
+class ParentRelationships:
+    """Resolve direct and ultimate parents of LEI records, caching each relationship per LEI"""
+
+    def __init__(self, api, cache, ttl=86400):
+        self.api = api
+        self.cache = cache
+        self.ttl = ttl
+        self.pending = {}
+
+    async def get(self, lei, kind, url):
+        """Parent relationship record of kind ("direct" or "ultimate"), or None"""
+        record = self.cache.get(("lei-parent", kind, lei))
+        if record is not None:
+            return record or None
+        if (kind, lei) not in self.pending:
+            task = asyncio.create_task(self.fetch(lei, kind, url))
+            self.pending[(kind, lei)] = task
+            task.add_done_callback(lambda _: self.pending.pop((kind, lei), None))
+        # Shared by concurrent callers, so one caller cancelling must not cancel it
+        return await asyncio.shield(self.pending[(kind, lei)])
+
+    async def fetch(self, lei, kind, url):
+        json_data = await limited(source_limiter(self.api),
+                                  source_plan(self.api).download("company_detail", url, {}, {}))
+        if not isinstance(json_data, dict):
+            # Request failed, so don't cache the absence of a parent
+            return None
+        record = json_data.get("data") or {}
+        self.cache.set(("lei-parent", kind, lei), record, expire=self.ttl)
+        return record or None
+
+    async def resolve(self, records):
+        """Parent relationship records of LEI records, and the parent LEI records they point to"""
+        lookups = [self.get(self.api.identifier(record), kind, url)
+                   for record in records
+                   for kind, url in self.api.extract_links(record).items()]
+        relationships = []
+        for relationship in await asyncio.gather(*lookups, return_exceptions=True):
+            if isinstance(relationship, Exception):
+                # Only this entity's relationship is dropped
+                print(f"Parent relationship lookup failed: {relationship!r}")
+            elif relationship:
+                relationships.append(relationship)
+        known = {self.api.identifier(record) for record in records}
+        leis = list(dict.fromkeys(self.api.interested_id(relationship)
+                                  for relationship in relationships))
+        # Parents outside the page are fetched together in batched LEI lookups
+        parents = await lei_batcher(self.api).get_many([lei for lei in leis if lei not in known])
+        return relationships, [parent for parent in parents.values() if parent]
+
+# Tasks are bound to an event loop, so keep one resolver per running loop
+_resolvers = weakref.WeakKeyDictionary()
+_cache = None
+
+def parent_relationships(api):
+    """Shared parent relationship resolver for GLEIF api"""
+    global _cache
+    loop = asyncio.get_running_loop()
+    if loop not in _resolvers:
+        if _cache is None:
+            _cache = cache_init(Path(app_config["caching"]["cache_dir"]) / "lei-relationships")
+        config = app_config.get("gleif", {})
+        _resolvers[loop] = ParentRelationships(api, _cache,
+                                               ttl=config.get("relationship_ttl", 86400))
+    return _resolvers[loop]
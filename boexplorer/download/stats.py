@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+
+@dataclass
+class PayloadStats:
+    """Response payload sizes and JSON decode times for an endpoint"""
+    responses: int = 0
+    size: int = 0
+    decode_time: float = 0.0
+
+    def add(self, size, decode_time):
+        self.responses += 1
+        self.size += size
+        self.decode_time += decode_time
+
+    @property
+    def mean_size(self):
+        return self.size / self.responses if self.responses else 0
+
+    @property
+    def mean_decode_time(self):
+        return self.decode_time / self.responses if self.responses else 0
+
+_stats = {}
+
+def endpoint(url):
+    """Host and path of url (query parameters excluded)"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+def record_payload(url, size, decode_time):
+    """Record a downloaded payload of size bytes, decoded in decode_time seconds"""
+    _stats.setdefault(endpoint(url), PayloadStats()).add(size, decode_time)
+
+def payload_stats():
+    """Payload stats by endpoint"""
+    return dict(_stats)
+
+def reset_payload_stats():
+    _stats.clear()
+
+def payload_summary():
+    """Lines summarising payload stats, largest transfers first"""
+    return [f"{url}: {stats.responses} responses, {stats.size / 1024:.1f} KiB "
+            f"(mean {stats.mean_size / 1024:.1f} KiB), "
+            f"decode {stats.decode_time * 1000:.1f} ms (mean {stats.mean_decode_time * 1000:.2f} ms)"
+            for url, stats in sorted(_stats.items(), key=lambda item: -item[1].size)]
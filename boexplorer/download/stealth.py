@@ -1,13 +1,19 @@
+import functools
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium_stealth import stealth
 
-from boexplorer.download.utils import get_random_user_agent
+
+@functools.cache
+def chrome_driver_path():
+    """Resolve Chromedriver executable once per process"""
+    return ChromeDriverManager().install()
 
 def create_stealth_driver(user_agent):
     # create a new Service instance and specify path to Chromedriver executable
-    service = ChromeService(executable_path=ChromeDriverManager().install())
+    service = ChromeService(executable_path=chrome_driver_path())
 
     # create a ChromeOptions object
     options = webdriver.ChromeOptions()
@@ -66,11 +72,3 @@ def extract_cookie(cookies, name):
         if cookie['name'] == name:
             return f"{cookie['name']}={cookie['value']}"
     return None
-
-def session_cookie(url, cookie_name):
-    user_agent = get_random_user_agent()
-    driver = create_stealth_driver(user_agent)
-    cookies = fetch_cookies(driver, url)
-    cookie = extract_cookie(cookies, cookie_name)
-    driver.quit()
-    return user_agent, cookie
@@ -0,0 +1,47 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from boexplorer.config import app_config
+
+_executor = None
+
+def executor_workers():
+    """Configured number of worker processes (0 runs everything inline)"""
+    return app_config.get("processing", {}).get("workers", min(4, os.cpu_count() or 1))
+
+def executor():
+    """Shared process pool for CPU-bound parsing and transforms"""
+    global _executor
+    if _executor is None and executor_workers() > 0:
+        _executor = ProcessPoolExecutor(max_workers=executor_workers())
+    return _executor
+
+class UnknownSource(LookupError):
+    """Source adapter isn't registered in the worker process"""
+
+def source_api(scheme):
+    """Adapter for source within a worker process"""
+    from boexplorer.apis import search_companies_apis, search_persons_apis
+    for api in search_companies_apis + search_persons_apis:
+        if api.scheme == scheme:
+            return api
+    raise UnknownSource(scheme)
+
+def call_with_source(function, scheme, *args):
+    return function(source_api(scheme), *args)
+
+async def run_cpu(function, api, *args):
+    """Run function(api, *args) in the process pool, or inline if there is none.
+
+    Adapters are looked up by scheme in the worker, so only plain data crosses
+    the process boundary. Errors raised by function itself propagate."""
+    pool = executor()
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, call_with_source, function, api.scheme, *args)
+        except (BrokenProcessPool, UnknownSource) as exception:
+            print(f"Running {function.__name__} inline: {exception!r}")
+    return function(api, *args)
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+from boexplorer.config import app_config
+from boexplorer.search import cancel_tasks, stream_company_search, stream_person_search
+
+FINISHED = ("done", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created REAL NOT NULL,
+    heartbeat REAL
+)
+"""
+
+class JobQueue:
+    """SQLite-backed queue of search jobs, shared by the app and worker processes"""
+
+    def __init__(self, path, stale_after=300):
+        self.path = path
+        self.stale_after = stale_after
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self.connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def submit(self, kind, text):
+        """Queue a search, returning its job id"""
+        job_id = str(uuid.uuid4())
+        with closing(self.connect()) as connection:
+            connection.execute("INSERT INTO jobs (id, kind, text, status, created) "
+                               "VALUES (?, ?, ?, 'queued', ?)",
+                               (job_id, kind, text, time.time()))
+        return job_id
+
+    def claim(self, worker):
+        """Claim the oldest queued job for worker (requeuing jobs whose worker has died)"""
+        now = time.time()
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("UPDATE jobs SET status = 'queued', worker = NULL "
+                                   "WHERE status = 'running' AND heartbeat < ?",
+                                   (now - self.stale_after,))
+                row = connection.execute("SELECT id, kind, text FROM jobs WHERE status = 'queued' "
+                                         "ORDER BY created LIMIT 1").fetchone()
+                if row is not None:
+                    connection.execute("UPDATE jobs SET status = 'running', worker = ?, "
+                                       "heartbeat = ? WHERE id = ?", (worker, now, row["id"]))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return dict(row) if row is not None else None
+
+    def progress(self, job_id, bods_data):
+        """Record partial results, returning False if the job is no longer running"""
+        with closing(self.connect()) as connection:
+            cursor = connection.execute("UPDATE jobs SET result = ?, version = version + 1, "
+                                        "heartbeat = ? WHERE id = ? AND status = 'running'",
+                                        (json.dumps(bods_data), time.time(), job_id))
+            return cursor.rowcount == 1
+
+    def touch(self, job_id):
+        """Show job's worker is still alive"""
+        with closing(self.connect()) as connection:
+            connection.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running'",
+                               (time.time(), job_id))
+
+    def finish(self, job_id, bods_data=None, error=None):
+        """Record final results (or error) of a running job"""
+        with closing(self.connect()) as connection:
+            if error is None:
+                connection.execute("UPDATE jobs SET status = 'done', result = ?, "
+                                   "version = version + 1 WHERE id = ? AND status = 'running'",
+                                   (json.dumps(bods_data), job_id))
+            else:
+                connection.execute("UPDATE jobs SET status = 'failed', error = ?, "
+                                   "version = version + 1 WHERE id = ? AND status = 'running'",
+                                   (error, job_id))
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job"""
+        with closing(self.connect()) as connection:
+            connection.execute("UPDATE jobs SET status = 'cancelled', version = version + 1 "
+                               "WHERE id = ? AND status IN ('queued', 'running')", (job_id,))
+
+    def get(self, job_id):
+        """Current status and results of a job"""
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+def jobs_config():
+    return app_config.get("jobs", {})
+
+def jobs_enabled():
+    """Whether searches are run by worker processes"""
+    return jobs_config().get("enabled", False)
+
+_queue = None
+
+def job_queue():
+    """Configured job queue"""
+    global _queue
+    if _queue is None:
+        config = jobs_config()
+        path = config.get("database",
+                          os.path.join(app_config["caching"]["cache_dir"], "jobs.sqlite"))
+        _queue = JobQueue(path, stale_after=config.get("stale_after", 300))
+    return _queue
+
+async def stream_job(job_id, queue=None, poll_interval=None):
+    """Yield each new version of a job's status and results until it finishes.
+
+    Abandoning the stream leaves the job running, so it can be followed again by job_id."""
+    queue = queue or job_queue()
+    if poll_interval is None:
+        poll_interval = jobs_config().get("poll_interval", 0.5)
+    version = 0
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            return
+        if job["version"] > version:
+            version = job["version"]
+            if job["result"] is not None:
+                yield job["status"], job["result"]
+        if job["status"] in FINISHED:
+            return
+        await asyncio.sleep(poll_interval)
+
+async def heartbeat(queue, job_id):
+    while True:
+        await asyncio.sleep(queue.stale_after / 3)
+        await asyncio.to_thread(queue.touch, job_id)
+
+async def run_job(queue, job):
+    """Run a search job, persisting results as each source completes"""
+    stream = stream_company_search if job["kind"] == "company" else stream_person_search
+    results = stream(job["text"])
+    beating = asyncio.create_task(heartbeat(queue, job["id"]))
+    bods_data = {}
+    try:
+        async for _, bods_data in results:
+            if not await asyncio.to_thread(queue.progress, job["id"], bods_data):
+                print(f"Job {job['id']} cancelled")
+                return
+        await asyncio.to_thread(queue.finish, job["id"], bods_data)
+    except Exception as exception:
+        print(f"Job {job['id']} failed: {exception!r}")
+        await asyncio.to_thread(queue.finish, job["id"], error=repr(exception))
+    finally:
+        await results.aclose()
+        await cancel_tasks([beating])
+
+async def run_worker(queue=None, workers=None, poll_interval=None):
+    """Claim and run search jobs until cancelled.
+
+    Jobs interrupted by stopping the worker are requeued once their heartbeat goes stale."""
+    queue = queue or job_queue()
+    workers = workers or jobs_config().get("workers", 4)
+    if poll_interval is None:
+        poll_interval = jobs_config().get("poll_interval", 0.5)
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    slots = asyncio.Semaphore(workers)
+    running = set()
+
+    def job_done(task):
+        running.discard(task)
+        slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            job = await asyncio.to_thread(queue.claim, worker)
+            if job is None:
+                slots.release()
+                await asyncio.sleep(poll_interval)
+                continue
+            print(f"Running {job['kind']} search job {job['id']}: {job['text']}")
+            task = asyncio.create_task(run_job(queue, job))
+            running.add(task)
+            task.add_done_callback(job_done)
+    finally:
+        await cancel_tasks(list(running))
@@ -0,0 +1,114 @@
+import re
+
+# Scheme keywords that may prefix an identifier in a search
+KEYWORDS = {"LEI": ["XI-LEI"],
+            "KRS": ["PL-KRS"],
+            "EIK": ["BG-EIK"],
+            "UIC": ["BG-EIK"],
+            "CRN": ["GB-COH"],
+            "ICO": ["CZ-CR", "SK-ORSR"],
+            "IČO": ["CZ-CR", "SK-ORSR"],
+            "CVR": ["DK-CVR"],
+            "SIREN": ["FR-RCS"],
+            "RC": ["NG-CAC"]}
+
+SCHEMES = ("XI-LEI", "PL-KRS", "BG-EIK", "GB-COH", "CZ-CR", "SK-ORSR", "DK-CVR", "FR-RCS",
+           "LV-RE", "EE-RIK", "NG-CAC")
+
+def valid_lei(text):
+    """ISO 17442 check digits"""
+    if not re.fullmatch(r"[A-Z0-9]{18}[0-9]{2}", text):
+        return False
+    return int("".join(str(int(char, 36)) for char in text)) % 97 == 1
+
+def valid_ico(text):
+    """Czech/Slovak IČO check digit"""
+    if not re.fullmatch(r"\d{8}", text):
+        return False
+    total = sum(int(digit) * weight for digit, weight in zip(text[:7], range(8, 1, -1), strict=True))
+    return (11 - total % 11) % 10 == int(text[7])
+
+def valid_cvr(text):
+    """Danish CVR modulus 11 check"""
+    if not re.fullmatch(r"\d{8}", text):
+        return False
+    return sum(int(digit) * weight for digit, weight in zip(text, (2, 7, 6, 5, 4, 3, 2, 1), strict=True)) % 11 == 0
+
+def weighted_check(digits, first_weights, second_weights):
+    """Modulus 11 check digit with a second set of weights if the first gives 10"""
+    for weights in (first_weights, second_weights):
+        remainder = sum(int(digit) * weight for digit, weight in zip(digits, weights, strict=True)) % 11
+        if remainder != 10:
+            return remainder
+    return 0
+
+def valid_eik(text):
+    """Bulgarian EIK (9 digits, or 13 for branches)"""
+    if not re.fullmatch(r"\d{9}|\d{13}", text):
+        return False
+    if weighted_check(text[:8], range(1, 9), range(3, 11)) != int(text[8]):
+        return False
+    if len(text) == 13:
+        return weighted_check(text[8:12], (2, 7, 3, 5), (4, 9, 5, 7)) == int(text[12])
+    return True
+
+def valid_estonian_code(text):
+    """Estonian registry code"""
+    if not re.fullmatch(r"[1789]\d{7}", text):
+        return False
+    return weighted_check(text[:7], range(1, 8), range(3, 10)) == int(text[7])
+
+def valid_siren(text):
+    """French SIREN (Luhn)"""
+    if not re.fullmatch(r"\d{9}", text):
+        return False
+    total = 0
+    for position, digit in enumerate(reversed(text)):
+        value = int(digit) * (2 if position % 2 else 1)
+        total += value - 9 if value > 9 else value
+    return total % 10 == 0
+
+def scheme_identifier(scheme, identifier):
+    """Normalise identifier for scheme"""
+    if scheme == "PL-KRS" and identifier.isdigit():
+        return f"{int(identifier):010d}"
+    if scheme == "GB-COH" and identifier.isdigit():
+        return identifier.zfill(8)
+    if scheme == "NG-CAC":
+        return re.sub(r"^RC", "", identifier)
+    return identifier
+
+def identifier_candidates(text):
+    """Recognise (scheme, identifier) candidates for an identifier search, most likely first"""
+    text = text.strip().upper()
+    compact = re.sub(r"[\s.\-/]", "", text)
+    for scheme in SCHEMES:
+        # Fully qualified, e.g. GB-COH-01234567
+        if text.startswith(scheme + "-") or text.startswith(scheme + " "):
+            identifier = re.sub(r"\s", "", text[len(scheme) + 1:])
+            return [(scheme, scheme_identifier(scheme, identifier))] if identifier else []
+    match = re.fullmatch(r"(LEI|KRS|EIK|UIC|CRN|ICO|IČO|CVR|SIREN|RC)[\s:.\-]*([A-Z0-9]+)", compact)
+    if match and not valid_lei(compact):
+        keyword, identifier = match.groups()
+        return [(scheme, scheme_identifier(scheme, identifier)) for scheme in KEYWORDS[keyword]]
+    candidates = []
+    if valid_lei(compact):
+        candidates.append(("XI-LEI", compact))
+    elif re.fullmatch(r"RC\d+", compact):
+        candidates.append(("NG-CAC", compact[2:]))
+    elif re.fullmatch(r"[A-Z]{2}\d{6}", compact):
+        candidates.append(("GB-COH", compact))
+    elif re.fullmatch(r"\d{10}", compact):
+        candidates.append(("PL-KRS", compact))
+    elif re.fullmatch(r"\d{11}", compact):
+        candidates.append(("LV-RE", compact))
+    elif re.fullmatch(r"\d{9}|\d{13}", compact):
+        if valid_eik(compact): candidates.append(("BG-EIK", compact))
+        if valid_siren(compact): candidates.append(("FR-RCS", compact))
+    elif re.fullmatch(r"\d{8}", compact):
+        if valid_ico(compact): candidates.extend([("CZ-CR", compact), ("SK-ORSR", compact)])
+        if valid_cvr(compact): candidates.append(("DK-CVR", compact))
+        if valid_estonian_code(compact): candidates.append(("EE-RIK", compact))
+        # Companies House numbers have no check digit
+        candidates.append(("GB-COH", compact))
+    return candidates
@@ -1,6 +1,15 @@
 
 def build_company_name_query(api, text, page_size=100, page_number=1):
     query_params = api.query_company_name_params(api.to_local_characters(text))
+    return build_company_search_query(api, query_params, page_size=page_size,
+                                      page_number=page_number)
+
+def build_company_ident_query(api, identifier, page_size=100, page_number=1):
+    query_params = api.query_company_id_params(identifier)
+    return build_company_search_query(api, query_params, page_size=page_size,
+                                      page_number=page_number)
+
+def build_company_search_query(api, query_params, page_size=100, page_number=1):
     if isinstance(query_params, dict):
         if api.query_company_name_extra: query_params = query_params | api.query_company_name_extra
         other_params = {}
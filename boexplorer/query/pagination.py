@@ -0,0 +1,26 @@
+import math
+
+
+def paginated(api):
+    """Source accepts a page number parameter"""
+    return bool(api.page_number_par[0])
+
+def plan_page_size(api, max_results):
+    """Largest page size the source returns, up to max_results"""
+    if api.page_size_par[0]:
+        return max(1, min(api.page_size_max, max_results))
+    else:
+        return api.page_size_max
+
+def plan_pages(api, max_results, total=None):
+    """Minimum page numbers needed to reach max_results (or total, if known)"""
+    if not paginated(api):
+        return [1]
+    page_size = plan_page_size(api, max_results)
+    wanted = max_results if total is None else min(total, max_results)
+    return list(range(1, max(1, math.ceil(wanted / page_size)) + 1))
+
+def last_page(api, data, count, max_results):
+    """Detect end of results from the latest page"""
+    return (not paginated(api) or len(data) < plan_page_size(api, max_results) or
+            count >= max_results)
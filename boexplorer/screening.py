@@ -0,0 +1,100 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from boexplorer.apis import search_companies_apis, search_persons_apis
+from boexplorer.config import app_config
+from boexplorer.search import lookup_api, stream_company_search, stream_person_search
+from boexplorer.utils.text import normalise_name
+
+
+@dataclass
+class ScreeningResult:
+    """Results of screening one (deduplicated) name"""
+    name: str
+    inputs: List[str]
+    bods_data: dict
+    elapsed: float
+    completed: int
+    total: int
+    throughput: float
+
+def screening_concurrency():
+    """Configured number of names searched at once"""
+    return app_config.get("screening", {}).get("concurrency", 4)
+
+def screening_apis(kind, sources=None):
+    """Source apis for kind of search, optionally restricted to source schemes"""
+    apis = search_companies_apis if kind == "company" else search_persons_apis
+    if sources is None:
+        return apis
+    selected = []
+    for source in sources:
+        api = lookup_api(source, apis) if isinstance(source, str) else source
+        if api is None:
+            raise ValueError(f"Unknown {kind} source: {source}")
+        selected.append(api)
+    return selected
+
+def deduplicate_names(names):
+    """Map each normalised name to the input names it covers (in input order)"""
+    unique = {}
+    for name in names:
+        key = normalise_name(name)
+        if key:
+            unique.setdefault(key, []).append(name)
+    return unique
+
+async def search_name(text, kind, apis, deadline=None):
+    """Run a full search for a single name"""
+    stream = stream_company_search if kind == "company" else stream_person_search
+    bods_data = None
+    async for _, bods_data in stream(text, apis=apis, deadline=deadline):
+        pass
+    return bods_data
+
+async def screen(names, kind="company", sources=None, concurrency=None, deadline=None):
+    """Screen a list of names, yielding a ScreeningResult per unique name as it completes.
+
+    All names share the per-source request limiters, connection settings and cache,
+    and at most concurrency names are searched at once."""
+    if kind not in ("company", "person"):
+        raise ValueError(f"Unknown search kind: {kind}")
+    apis = screening_apis(kind, sources)
+    unique = deduplicate_names(names)
+    limit = concurrency or screening_concurrency()
+    queued = iter(unique.values())
+    start = time.monotonic()
+    completed = 0
+
+    async def run(inputs):
+        name = " ".join(inputs[0].split())
+        began = time.monotonic()
+        bods_data = await search_name(name, kind, apis, deadline=deadline)
+        return name, inputs, bods_data, time.monotonic() - began
+
+    def schedule():
+        inputs = next(queued, None)
+        return asyncio.create_task(run(inputs)) if inputs else None
+
+    pending = {task for task in (schedule() for _ in range(limit)) if task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, inputs, bods_data, elapsed = task.result()
+                completed += 1
+                task = schedule()
+                if task: pending.add(task)
+                yield ScreeningResult(name=name,
+                                      inputs=inputs,
+                                      bods_data=bods_data,
+                                      elapsed=elapsed,
+                                      completed=completed,
+                                      total=len(unique),
+                                      throughput=completed / max(time.monotonic() - start, 1e-6))
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
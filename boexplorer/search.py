@@ -1,17 +1,32 @@
 import asyncio
+import copy
+import itertools
 import json
 import pycountry
 
 from boexplorer.apis import search_companies_apis, search_persons_apis
-from boexplorer.download.query import download_json
-from boexplorer.query.name import (build_company_id_query, build_company_name_query,
-                                   build_company_persons_query)
+from boexplorer.apis.context import SearchContext
+from boexplorer.download.plan import compile_plans, source_plan
+from boexplorer.query.name import (build_company_id_query, build_company_ident_query,
+                                   build_company_name_query, build_company_persons_query)
 from boexplorer.query.person import build_person_name_query, build_person_id_query
-from boexplorer.transforms.bods_0_4_0 import transform_entity, transform_person
+from boexplorer.query.identifier import identifier_candidates
+from boexplorer.query.pagination import last_page, plan_page_size, plan_pages
+from boexplorer.transforms.bods_0_4_0 import transform_entity, transform_person, transform_relationship
+from boexplorer.download.batching import lei_batcher
+from boexplorer.download.relationships import parent_relationships
 from boexplorer.download.caching import cache_init
+from boexplorer.download.cookies import reject_session_cookie, session_cookie
+from boexplorer.download.limits import source_limiter, gather_limited, limited
 from boexplorer.config import app_config
+from boexplorer.crosswalk import crosswalk
+from boexplorer.deferred import deferred_persons, single_flight
+from boexplorer.executor import run_cpu
 
-def add_source(api, data, entity_count, person_count):
+# Compile each source's request plan once at startup
+compile_plans(search_companies_apis + search_persons_apis)
+
+def add_source(api, data, entity_count, person_count, status="complete"):
     source_id = api.scheme
     if api.scheme.split('-')[0] == "XI":
         country = "Global"
@@ -22,10 +37,12 @@ def add_source(api, data, entity_count, person_count):
                                'country': country,
                                'url': api.search_url,
                                'entity_count': entity_count,
-                               'person_count': person_count}
+                               'person_count': person_count,
+                               'status': status}
 
-def match_records(entities, data):
-    counter = {}
+def match_records(entities, data, counter=None):
+    if counter is None:
+        counter = {}
     for entity in entities:
         record_id = entity["recordId"]
         if record_id in data:
@@ -35,212 +52,721 @@ def match_records(entities, data):
         counter[record_id] = None
     return len(counter)
 
-def process_data(company_data, person_data, api, bods_data, search=None):
+def transform_company_data(api, company_data, person_data, search=None, detail=False):
+    """Filter and transform source data into BODS statements"""
+    api = api.bind(SearchContext(text=search, search_type="company"))
     entities = []
     persons = []
-    links = []
     for item in company_data:
         #print("Company item:", item)
+        if detail:
+            api.company_prepocessing(item)
         if not api.filter_result(item, search=search):
             print("Transforming ...")
             entities.append(transform_entity(item, api))
-        #links.extend(api.extract_links(item))
-    #for link in links:
-    #    json_data = download_json(url, {})
-    #    if api.extract_type(json_data) == "relationship":
     for item in person_data:
         #print("Person item:", item)
         if not api.filter_result(item, search_type="company"):
             print("Transforming ...")
             persons.append(transform_person(item, api))
-    entity_count = match_records(entities, bods_data['entities'])
-    person_count = match_records(persons, bods_data['persons'])
-    add_source(api, bods_data['sources'], entity_count, person_count)
+    return entities, persons
 
-def process_person_data(source_data, api, bods_data, search=None):
+def transform_relationship_data(api, relationships, parents, children):
+    """Transform parent entities and relationship source data into BODS statements"""
+    api = api.bind(SearchContext(search_type="company"))
+    record_ids = {api.identifier(item): api.record_id(item) for item in children + parents}
+    entities = [transform_entity(item, api) for item in parents]
+    relationships = [transform_relationship(item, api, record_ids) for item in relationships]
+    return entities, relationships
+
+def transform_person_data(api, source_data, search=None):
+    """Filter and transform person source data into BODS statements"""
+    api = api.bind(SearchContext(text=search, search_type="person"))
     print("Processing:", len(source_data))
     persons = []
-    links = []
     for item in source_data:
         print("Person item:", item, api.filter_result(item, search_type="person"))
         if not api.filter_result(item, search_type="person"):
             print("Transforming ...")
             persons.append(transform_person(item, api))
+    return persons
+
+def merge_company_data(entities, persons, api, bods_data):
+    entity_count = match_records(entities, bods_data['entities'])
+    person_count = match_records(persons, bods_data['persons'])
+    add_source(api, bods_data['sources'], entity_count, person_count)
+
+def merge_person_data(persons, api, bods_data):
     print(json.dumps(persons, indent=2))
     person_count = match_records(persons, bods_data['persons'])
     add_source(api, bods_data['sources'], 0, person_count)
 
-async def fetch_all_data(api, text, bods_data, max_results=100):
-    cache = cache_init(app_config["caching"]["cache_dir"])
-    page_number = 1
-    page_size = 25
+def merge_bods_data(bods_data, update, replace_sources=True):
+    """Copy of bods_data with the statements and source summaries of update added.
+
+    Unless replace_sources is set, source summaries already in bods_data are kept."""
+    merged = copy.deepcopy(bods_data)
+    for section, records in update.items():
+        target = merged.setdefault(section, {})
+        if section == 'sources':
+            for source_id, source in records.items():
+                if replace_sources or source_id not in target:
+                    target[source_id] = source
+            continue
+        for record_id, statements in records.items():
+            existing = target.setdefault(record_id, [])
+            existing.extend([statement for statement in statements if statement not in existing])
+    return merged
+
+def process_person_data(source_data, api, bods_data, search=None):
+    persons = transform_person_data(api, source_data, search=search)
+    merge_person_data(persons, api, bods_data)
+
+async def process_person_data_async(source_data, api, bods_data, search=None):
+    """Process person source data, transforming in the executor"""
+    persons = await run_cpu(transform_person_data, api, source_data, search)
+    merge_person_data(persons, api, bods_data)
+
+def extract_page(api, json_data):
+    return api.extract_data(json_data)
+
+def extract_entity_persons(api, json_data):
+    return api.extract_entity_persons_items(json_data)
+
+async def fetch_search_page(api, plan, build_query, text, search_type, page_number, page_size,
+                            header, cache):
+    url, query_params, other_params = build_query(api,
+                                                  text,
+                                                  page_size=page_size,
+                                                  page_number=page_number)
+    return await plan.download(search_type, url, query_params, other_params,
+                               header=header, cache=cache)
+
+class RequestRejected(Exception):
+    """Source rejected the search request"""
+
+async def iter_search_pages(api, plan, build_query, text, search_type, header, cache,
+                            max_results=100, check=True):
+    """Yield each page of search results, in parallel once the total result count is known.
+
+    Raises RequestRejected if the source rejects the first request."""
+    limiter = source_limiter(api)
+    page_size = plan_page_size(api, max_results)
+    pages = plan_pages(api, max_results)
+
+    async def fetch_page(page_number):
+        return await limited(limiter, fetch_search_page(api, plan, build_query, text, search_type,
+                                                        page_number, page_size, header, cache))
+
+    async def page_items(json_data):
+        if check and not plan.check_result(json_data):
+            return None
+        if plan.requests[search_type].json_data:
+            data = plan.extract_data(json_data)
+        else:
+            # Parsing HTML pages is CPU-bound, so run it in the executor
+            data = await run_cpu(extract_page, api, json_data)
+        if data: print(json.dumps(data, indent=2))
+        return data
+
+    json_data = await fetch_page(pages[0])
+    if check and not plan.check_result(json_data):
+        raise RequestRejected(api.scheme)
+    data = await page_items(json_data)
+    if not data:
+        return
+    count = len(data)
+    yield data
+    if last_page(api, data, count, max_results):
+        return
+    total = plan.total_count(json_data)
+    if total is not None:
+        remaining = plan_pages(api, max_results, total=total)[1:]
+        for json_data in await asyncio.gather(*[fetch_page(page_number) for page_number in remaining]):
+            data = await page_items(json_data)
+            if not data:
+                break
+            yield data
+        return
+    # No total reported, so speculatively prefetch the next page while processing this one
+    remaining = iter(pages[1:])
+
+    def prefetch():
+        page_number = next(remaining, None)
+        return asyncio.create_task(fetch_page(page_number)) if page_number else None
+
+    next_page = prefetch()
+    try:
+        while next_page:
+            json_data = await next_page
+            next_page = prefetch()
+            data = await page_items(json_data)
+            if not data:
+                break
+            count += len(data)
+            yield data
+            if last_page(api, data, count, max_results):
+                break
+    finally:
+        if next_page: next_page.cancel()
+
+async def fetch_search_pages(api, plan, build_query, text, search_type, header, cache,
+                             max_results=100, check=True):
+    """Fetch all search result pages.
+
+    Returns None if the source rejects the first request."""
     raw_data = []
-    count = 0
-    user_agent, cookie = api.session_cookie
-    header = api.http_headers
-    if user_agent: header["User-Agent"] = user_agent
-    if cookie: header["Cookie"] = cookie
-    while True:
-        url, query_params, other_params = build_company_name_query(api,
-                                                                   text,
-                                                                   page_size=page_size,
-                                                                   page_number=page_number)
-        json_data = await download_json(url, query_params, other_params,
-                                  post=api.http_post["company_search"],
-                                  post_pagination=api.post_pagination,
-                                  post_json=isinstance(query_params, dict),
-                                  json_data=api.return_json["company_search"],
-                                  header=header,
-                                  auth=api.authenticator if not (isinstance(api.authenticator, dict) and
-                                                             not 'Authorization' in api.authenticator)
-                                                             else None,
-                                  cache=cache)
-        if not api.check_result(json_data):
-            break
-        data = api.extract_data(json_data)
-        if data:
-            print(json.dumps(data, indent=2))
+    try:
+        async for data in iter_search_pages(api, plan, build_query, text, search_type, header,
+                                            cache, max_results=max_results, check=check):
             raw_data.extend(data)
-            count += len(data)
-            if len(data) < page_size or count >= max_results:
+    except RequestRejected:
+        return None
+    return raw_data
+
+async def hydrate_entity(api, entity, header, cache, text=None, persons=True):
+    """Fetch an entity's detail and persons.
+
+    Returns the (detailed) entity and its person items, or None if the detail is rejected.
+    Unless persons is set, persons needing a separate request are not fetched and None is
+    returned in place of the person items."""
+    plan = source_plan(api)
+    if plan.requests["company_detail"].enabled and api.company_detail_url(entity):
+        url, params = build_company_id_query(api, entity)
+        json_data = await limited(source_limiter(api),
+                                  plan.download("company_detail", url, params, {},
+                                                header=header, cache=cache))
+        if not plan.check_result(json_data, detail=True):
+            return None
+        entity = json_data
+    return entity, await entity_persons(api, entity, header, cache, text=text, fetch=persons)
+
+async def entity_persons(api, entity, header, cache, text=None, fetch=True):
+    """Person items of an entity (None if they need a request and fetch isn't set)"""
+    plan = source_plan(api)
+    persons_plan = plan.requests["company_persons"]
+    if not (persons_plan.enabled or persons_plan.json_data):
+        return []
+    if (persons_plan.enabled and api.company_persons_url(entity) and
+        not api.filter_result(entity, search_type="company_persons", search=text)):
+        if not fetch:
+            return None
+        url, params = build_company_persons_query(api, entity)
+        json_data = await limited(source_limiter(api),
+                                  plan.download("company_persons", url, params, {},
+                                                header=header, cache=cache))
+    else:
+        json_data = [entity]
+    if persons_plan.json_data:
+        return api.extract_entity_persons_items(json_data)
+    else:
+        return await run_cpu(extract_entity_persons, api, json_data)
+
+async def load_entity_persons(record_id, apis=None):
+    """Person statements of an entity whose persons were deferred, fetched once and cached"""
+    store = deferred_persons()
+    if apis is None:
+        apis = search_companies_apis
+
+    async def fetch():
+        persons = await asyncio.to_thread(store.persons, record_id)
+        if persons is not None:
+            return persons
+        sources = await asyncio.to_thread(store.sources, record_id)
+        if not sources:
+            return []
+        persons = []
+        cache = cache_init(app_config["caching"]["cache_dir"])
+        try:
+            for scheme, deferred in sources.items():
+                api = lookup_api(scheme, apis)
+                if api is None:
+                    continue
+                user_agent, cookie = await session_cookie(api)
+                person_data = await entity_persons(api, deferred["item"],
+                                                   source_plan(api).header(user_agent, cookie),
+                                                   cache, text=deferred["text"])
+                _, statements = await run_cpu(transform_company_data, api, [], person_data or [],
+                                              deferred["text"])
+                persons.extend(statements)
+        finally:
+            cache.close()
+        await asyncio.to_thread(store.set_persons, record_id, persons)
+        return persons
+
+    return await single_flight(("persons", record_id), fetch)
+
+def prefetch_top():
+    """Configured number of top entities per source whose persons are prefetched"""
+    return app_config.get("search", {}).get("prefetch_top", 3)
+
+def top_entities(bods_data, top_n):
+    """Record ids of the first top_n entities found by each source"""
+    counts = {}
+    record_ids = []
+    for record_id, statements in bods_data.get('entities', {}).items():
+        sources = {statement["source"]["description"] for statement in statements}
+        if any(counts.get(source, 0) < top_n for source in sources):
+            record_ids.append(record_id)
+        for source in sources:
+            counts[source] = counts.get(source, 0) + 1
+    return record_ids
+
+async def prefetch_entity_persons(bods_data, top_n=None, apis=None, poll_interval=0.1):
+    """Prefetch deferred persons of the top entities of each source into the cache.
+
+    Entities are fetched one at a time, and only while their sources have spare request
+    capacity, so searches and opened entities aren't held up."""
+    store = deferred_persons()
+    if apis is None:
+        apis = search_companies_apis
+    for record_id in top_entities(bods_data, prefetch_top() if top_n is None else top_n):
+        if await asyncio.to_thread(store.persons, record_id) is not None:
+            continue
+        sources = await asyncio.to_thread(store.sources, record_id)
+        limiters = [source_limiter(api) for api in
+                    (lookup_api(scheme, apis) for scheme in sources) if api is not None]
+        if not limiters:
+            continue
+        while any(limiter.locked() for limiter in limiters):
+            await asyncio.sleep(poll_interval)
+        await load_entity_persons(record_id, apis=apis)
+
+async def record_identifiers(statements):
+    """Add identifiers of entity statements to the crosswalk"""
+    await asyncio.to_thread(crosswalk().record_statements, statements)
+
+def identified_items(api, items, identifier):
+    """Search items with identifier (all items if search results don't include identifiers)"""
+    selected = []
+    for item in items:
+        try:
+            if str(api.identifier(item)) != str(identifier):
+                continue
+        except (KeyError, TypeError):
+            pass
+        selected.append(item)
+    return selected
+
+async def lookup_company_id(api, identifier, header, cache):
+    """Search items for an entity identifier, or None if the source can't search by identifier"""
+    plan = source_plan(api)
+    if api.scheme == "XI-LEI":
+        # LEI lookups are batched across callers
+        record = await lei_batcher(api).get(identifier)
+        return [record] if record else []
+    if plan.requests["company_detail"].enabled and api.company_id_item(identifier):
+        # Detail fetched directly by identifier
+        return [api.company_id_item(identifier)]
+    if api.query_company_id_params(identifier) is None:
+        return None
+    url, query_params, other_params = build_company_ident_query(api, identifier, page_size=10)
+    json_data = await limited(source_limiter(api),
+                              plan.download("company_search", url, query_params, other_params,
+                                            header=header, cache=cache))
+    if not plan.check_result(json_data):
+        return []
+    if plan.requests["company_search"].json_data:
+        items = plan.extract_data(json_data)
+    else:
+        items = await run_cpu(extract_page, api, json_data)
+    return identified_items(api, items or [], identifier)
+
+async def fetch_company_by_id(api, identifier, bods_data):
+    """Fetch an entity and its persons directly by identifier, merging them into bods_data.
+
+    Returns None if the source can't search by identifier."""
+    plan = source_plan(api)
+    cache = cache_init(app_config["caching"]["cache_dir"])
+    try:
+        user_agent, cookie = await session_cookie(api)
+        header = plan.header(user_agent, cookie)
+        items = await lookup_company_id(api, identifier, header, cache)
+        if items is None:
+            return None
+        hydrated = [entity for entity in await asyncio.gather(*[hydrate_entity(api, item, header, cache)
+                                                                for item in items])
+                    if entity is not None]
+        company_data = [entity for entity, _ in hydrated]
+        person_data = [person for _, persons in hydrated for person in persons]
+        entities, persons = await run_cpu(transform_company_data, api, company_data, person_data,
+                                          None, plan.requests["company_detail"].enabled)
+        entity_count = match_records(entities, bods_data['entities'])
+        person_count = match_records(persons, bods_data['persons'])
+        await record_identifiers(entities)
+        return api, entity_count, person_count
+    finally:
+        cache.close()
+
+def supports_id_lookup(api, identifier):
+    """Whether source can fetch an entity by identifier"""
+    return ((source_plan(api).requests["company_detail"].enabled and
+             api.company_id_item(identifier) is not None) or
+            api.query_company_id_params(identifier) is not None)
+
+def identifier_routes(text, apis):
+    """Sources and identifiers to look up for an identifier search, and the sources of
+    recognised identifiers that can't be looked up.
+
+    Identifiers of sources that can't be looked up directly are routed via the crosswalk."""
+    routes = {}
+    unsupported = {}
+    for scheme, identifier in identifier_candidates(text):
+        for route_scheme, route_identifier in [(scheme, identifier)] + crosswalk().linked(scheme, identifier):
+            api = lookup_api(route_scheme, apis)
+            if api and api.scheme not in routes and supports_id_lookup(api, route_identifier):
+                routes[api.scheme] = (api, route_identifier)
                 break
-            page_number += 1
         else:
-            break
-    if api.http_post["company_detail"] is not None and raw_data:
-        company_data = []
-        for entity in raw_data:
-            url, params = build_company_id_query(api, entity)
-            json_data = await download_json(url, params, {},
-                                      post=api.http_post["company_detail"],
-                                      header=header,
-                                      auth=api.authenticator if not (isinstance(api.authenticator, dict) and
-                                                             not 'Authorization' in api.authenticator)
-                                                             else None,
-                                      cache=cache)
-            if api.check_result(json_data, detail=True):
-                company_data.append(json_data)
-                api.company_prepocessing(json_data)
-    else:
-        company_data = raw_data
-    persons_data = []
-    if (api.http_post["company_persons"] is not None or
-        (api.http_post["company_persons"] is None and
-         api.return_json["company_persons"])) and company_data:
-        for entity in company_data:
-            if (api.http_post["company_persons"] is not None and api.company_persons_url(entity) and
-                not api.filter_result(entity, search_type="company_persons", search=text)):
-                #print(api.identifier(entity), api.filter_result(entity, search_type="company_persons"))
-                url, params = build_company_persons_query(api, entity)
-                #print(url, params)
-                json_data = await download_json(url, params, {},
-                                  verify=False,
-                                  post=api.http_post["company_persons"],
-                                  post_pagination=api.post_pagination,
-                                  post_json=isinstance(params, dict),
-                                  json_data=api.return_json["company_persons"],
-                                  header=header,
-                                  auth=api.authenticator if not (isinstance(api.authenticator, dict) and
-                                                             not 'Authorization' in api.authenticator)
-                                                             else None,
-                                  cache=cache)
-            else:
-                json_data = company_data
-            print("Return type", type(json_data))
-            for person in api.extract_entity_persons_items(json_data):
-                persons_data.append(person)
-    cache.close()
-    return api, company_data, persons_data
+            api = lookup_api(scheme, apis)
+            if api:
+                unsupported[api.scheme] = api
+    return (list(routes.values()),
+            [api for scheme, api in unsupported.items() if scheme not in routes])
+
+def queue_size():
+    """Configured size of each pipeline stage queue"""
+    return app_config.get("search", {}).get("queue_size", 20)
+
+def parent_limit():
+    """Configured number of a search's LEI records whose parents are resolved"""
+    return app_config.get("gleif", {}).get("parent_limit", 10)
+
+async def company_pipeline(api, text, bods_data, max_results=100, defer=False):
+    """Run a company search through bounded queue stages, merging results as they are produced.
+
+    Stages are pages -> items -> filtered items -> BODS statements, so transforms overlap
+    with downloads and only queue-sized batches of raw data are held at once. Items are
+    numbered in search order and merged in that order, however their hydration interleaves.
+    If defer is set, persons needing separate requests are left until an entity is opened."""
+    plan = source_plan(api)
+    detail_plan = plan.requests["company_detail"]
+    workers = api.http_concurrency
+    items = asyncio.Queue(queue_size())
+    entities = asyncio.Queue(queue_size())
+    # Bounds items between the search and the merge, including those held back for ordering
+    window = asyncio.Semaphore(2 * queue_size() + workers)
+    done = object()
+    positions = itertools.count()
+    counters = ({}, {})
+    # Each record costs up to one request per parent kind on a cold cache
+    parents_left = parent_limit() if api.scheme == "XI-LEI" else 0
+    header = None
+    cache = cache_init(app_config["caching"]["cache_dir"])
+
+    async def search():
+        async for data in iter_search_pages(api, plan, build_company_name_query, text,
+                                            "company_search", header, cache,
+                                            max_results=max_results):
+            for item in data:
+                await window.acquire()
+                await items.put((next(positions), item))
+
+    async def pages():
+        nonlocal header
+        user_agent, cookie = await session_cookie(api)
+        header = plan.header(user_agent, cookie)
+        try:
+            await search()
+        except RequestRejected:
+            if cookie:
+                # Session cookie rejected, so retry once with a fresh one
+                reject_session_cookie(api, cookie)
+                user_agent, cookie = await session_cookie(api)
+                header = plan.header(user_agent, cookie)
+                try:
+                    await search()
+                except RequestRejected:
+                    pass
+        for _ in range(workers):
+            await items.put(done)
+
+    async def hydrate():
+        while (entry := await items.get()) is not done:
+            position, entity = entry
+            hydrated = await hydrate_entity(api, entity, header, cache, text=text,
+                                            persons=not defer)
+            # Rejected entities are passed on too, so later items aren't held back
+            await entities.put((position, hydrated))
+
+    async def hydrate_all():
+        hydrators = [asyncio.create_task(hydrate()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*hydrators)
+        finally:
+            # A failed worker must not leave the others waiting for items
+            await cancel_tasks(hydrators)
+        await entities.put(done)
+
+    async def transform():
+        nonlocal parents_left
+        ready = {}
+        position = 0
+        finished = False
+        while not finished:
+            # Transform whatever has queued up in one executor call
+            received = [await entities.get()]
+            while not entities.empty():
+                received.append(entities.get_nowait())
+            if received[-1] is done:
+                received.pop()
+                finished = True
+            ready.update(received)
+            batch = []
+            while position in ready:
+                hydrated = ready.pop(position)
+                position += 1
+                window.release()
+                if hydrated is not None:
+                    batch.append(hydrated)
+            if not batch:
+                continue
+            company_data = [entity for entity, _ in batch]
+            person_data = [person for _, persons in batch for person in persons or []]
+            entity_statements, person_statements = await run_cpu(
+                transform_company_data, api, company_data, person_data, text, detail_plan.enabled)
+            match_records(entity_statements, bods_data['entities'], counters[0])
+            match_records(person_statements, bods_data['persons'], counters[1])
+            await record_identifiers(entity_statements)
+            deferred = [entity for entity, persons in batch if persons is None]
+            if deferred:
+                # Persons are fetched when the entity is opened
+                record_ids = {statement["recordId"] for statement in entity_statements}
+                await asyncio.to_thread(deferred_persons().defer, api.scheme,
+                                        [(api.record_id(entity), entity) for entity in deferred
+                                         if api.record_id(entity) in record_ids], text)
+            if parents_left > 0:
+                # Parent relationships of the top records resolve alongside the following batches
+                record_ids = {statement["recordId"] for statement in entity_statements}
+                children = [item for item in company_data
+                            if api.record_id(item) in record_ids][:parents_left]
+                parents_left -= len(children)
+                related.append(asyncio.create_task(relate(children)))
+
+    async def relate(children):
+        try:
+            relationships, parents = await parent_relationships(api).resolve(children)
+        except Exception as exception:
+            # Only these entities' relationships are lost, not the source's results
+            print(f"Parent relationships failed for {api.scheme}: {exception!r}")
+            return
+        if not relationships:
+            return
+        entity_statements, relationship_statements = await run_cpu(
+            transform_relationship_data, api, relationships, parents, children)
+        # Parents didn't match the search, so aren't counted in the source's results
+        match_records(entity_statements, bods_data['entities'])
+        match_records(relationship_statements, bods_data.setdefault('relationships', {}))
+        await record_identifiers(entity_statements)
+
+    related = []
+    stages = [asyncio.create_task(stage()) for stage in (pages, hydrate_all, transform)]
+    try:
+        await asyncio.gather(*stages)
+        await asyncio.gather(*related)
+        return api, len(counters[0]), len(counters[1])
+    finally:
+        await cancel_tasks(stages + related)
+        cache.close()
 
 async def fetch_person_data(api, text, bods_data, max_results=100):
+    # Plans are compiled once per adapter, so look it up before binding a per-search copy
+    plan = source_plan(api)
+    api = api.bind(SearchContext(text=text, search_type="person"))
     person_data = api.query_person_name_params(api.to_local_characters(text))
     if isinstance(person_data, list):
         return api, api.extract_person_data(person_data)
     cache = cache_init(app_config["caching"]["cache_dir"])
-    page_number = 1
-    page_size = 25
-    raw_data = []
-    count = 0
-    user_agent, cookie = api.session_cookie
-    header = {}
-    if user_agent: header["User-Agent"] = user_agent
-    if cookie: header["Cookie"] = cookie
-    while True:
-        url, query_params, other_params = build_person_name_query(api,
-                                                                  text,
-                                                                  page_size=page_size,
-                                                                  page_number=page_number)
-        json_data = await download_json(url, query_params, other_params,
-                                  post=api.http_post["person_search"],
-                                  post_pagination=api.post_pagination,
-                                  post_json=isinstance(query_params, dict),
-                                  json_data=api.return_json["person_search"],
-                                  header=header,
-                                  auth=api.authenticator if not (isinstance(api.authenticator, dict) and
-                                                             not 'Authorization' in api.authenticator)
-                                                             else None,
-                                  timeout=api.http_timeout,
-                                  cache=cache)
-        print(json.dumps(json_data, indent=2))
-        #if not api.check_result(json_data):
-        #    break
-        data = api.extract_data(json_data)
-        if data:
-            print(json.dumps(data, indent=2))
-            raw_data.extend(data)
-            count += len(data)
-            if len(data) < page_size or count >= max_results:
-                break
-            page_number += 1
+    try:
+        user_agent, cookie = await session_cookie(api)
+        header = plan.header(user_agent, cookie)
+        raw_data = await fetch_search_pages(api, plan, build_person_name_query, text, "person_search",
+                                            header, cache, max_results=max_results, check=False)
+        if plan.requests["person_detail"].enabled and raw_data:
+            person_data = []
+            detail_tasks = []
+            for person in raw_data:
+                url, params = build_person_id_query(api, person)
+                detail_tasks.append(plan.download("person_detail", url, params, {},
+                                                  header=header, cache=cache))
+            for json_data in await gather_limited(source_limiter(api), detail_tasks):
+                print("Raw data:", json.dumps(json_data, indent=2))
+                if plan.check_result(json_data, detail=True):
+                    if isinstance(json_data, list):
+                        person_data.extend(json_data)
+                    else:
+                        person_data.append(json_data)
+                    api.person_prepocessing(json_data)
         else:
-            break
-    if api.http_post["person_detail"] is not None and raw_data:
-        person_data = []
-        for person in raw_data:
-            url, params = build_person_id_query(api, person)
-            json_data = await download_json(url, params, {},
-                                      post=api.http_post["person_detail"],
-                                      header=header,
-                                      auth=api.authenticator if not (isinstance(api.authenticator, dict) and
-                                                             not 'Authorization' in api.authenticator)
-                                                             else None,
-                                      timeout=api.http_timeout,
-                                      cache=cache)
-            print("Raw data:", json.dumps(json_data, indent=2))
-            if api.check_result(json_data, detail=True):
-                if isinstance(json_data, list):
-                    person_data.extend(json_data)
+            person_data = raw_data
+        return api, person_data
+    finally:
+        cache.close()
+
+async def probe_source(api, text, kind="company", max_results=100):
+    """Count search results from the first page only (reported total, if any), without
+    fetching details, persons or further pages"""
+    search_type = f"{kind}_search"
+    build_query = build_company_name_query if kind == "company" else build_person_name_query
+    if kind == "person":
+        person_data = api.query_person_name_params(api.to_local_characters(text))
+        if isinstance(person_data, list):
+            return api, 0, len(api.extract_person_data(person_data))
+    plan = source_plan(api)
+    cache = cache_init(app_config["caching"]["cache_dir"])
+    try:
+        user_agent, cookie = await session_cookie(api)
+        json_data = await limited(source_limiter(api),
+                                  fetch_search_page(api, plan, build_query, text, search_type,
+                                                    plan_pages(api, max_results)[0],
+                                                    plan_page_size(api, max_results),
+                                                    plan.header(user_agent, cookie), cache))
+        count = 0
+        if json_data and (kind == "person" or plan.check_result(json_data)):
+            count = plan.total_count(json_data) if isinstance(json_data, dict) else None
+            if count is None:
+                if plan.requests[search_type].json_data:
+                    data = plan.extract_data(json_data)
                 else:
-                    person_data.append(json_data)
-                api.person_prepocessing(json_data)
-    else:
-        person_data = raw_data
-    cache.close()
-    return api, person_data
+                    data = await run_cpu(extract_page, api, json_data)
+                count = len(data or [])
+        return (api, count, 0) if kind == "company" else (api, 0, count)
+    finally:
+        cache.close()
 
-async def perform_company_search(text):
-    bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    tasks = [fetch_all_data(api, text, bods_data) for api in search_companies_apis]
+def probe_enabled():
+    """Whether searches first show per-source counts, fetching results when a source is opened"""
+    return app_config.get("search", {}).get("probe", True)
 
-    # schedule the tasks and retrieve results
-    results = await asyncio.gather(*tasks)
+async def cancel_tasks(tasks):
+    """Cancel tasks and wait for them to release their connections"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
-    for result in results:
-        process_data(result[1], result[2], result[0], bods_data, search=text)
+def search_deadline():
+    """Configured time budget for a search (seconds)"""
+    return app_config.get("search", {}).get("deadline", 60)
 
-    return bods_data
+async def stream_search(fetches, process, bods_data, deadline=None):
+    """Yield each source's api and the merged results as that source completes.
 
-async def perform_person_search(text):
-    bods_data = {'persons': {}, 'sources': {}}
+    Sources still running when the deadline expires are cancelled and marked as
+    incomplete, so they can be retried individually."""
+    loop = asyncio.get_running_loop()
+    tasks = {asyncio.create_task(fetch): api for api, fetch in fetches}
+    pending = set(tasks)
+    end = loop.time() + deadline if deadline else None
+    try:
+        while pending:
+            timeout = None if end is None else max(0, end - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                api = tasks[task]
+                if task.exception():
+                    print(f"Search failed for {api.scheme}: {task.exception()!r}")
+                    add_source(api, bods_data['sources'], 0, 0, status="failed")
+                else:
+                    await process(*task.result())
+                yield api, bods_data
+        await cancel_tasks(pending)
+        for task in pending:
+            api = tasks[task]
+            print(f"Search deadline expired for {api.scheme}")
+            add_source(api, bods_data['sources'], 0, 0, status="incomplete")
+            yield api, bods_data
+    finally:
+        # Also reached when the search is superseded or abandoned by its consumer
+        await cancel_tasks(tasks)
+
+def stream_company_search(text, apis=None, bods_data=None, deadline=None, defer=False):
+    """Yield each source's api and the merged results as that source completes.
+
+    If defer is set, persons needing separate requests are left until an entity is opened
+    (see load_entity_persons), so the results leave them out."""
+    if bods_data is None:
+        bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+    if apis is None:
+        apis = search_companies_apis
+    fetches = [(api, company_pipeline(api, text, bods_data, defer=defer)) for api in apis]
+
+    async def process(api, entity_count, person_count):
+        add_source(api, bods_data['sources'], entity_count, person_count)
+
+    return stream_search(fetches, process, bods_data,
+                         deadline=search_deadline() if deadline is None else deadline)
+
+def stream_person_search(text, apis=None, bods_data=None, deadline=None):
+    """Yield each source's api and the merged results as that source completes"""
+    if bods_data is None:
+        bods_data = {'persons': {}, 'sources': {}}
+    if apis is None:
+        apis = search_persons_apis
+    fetches = [(api, fetch_person_data(api, text, bods_data)) for api in apis]
+
+    async def process(api, person_data):
+        await process_person_data_async(person_data, api, bods_data, search=text)
+
+    return stream_search(fetches, process, bods_data,
+                         deadline=search_deadline() if deadline is None else deadline)
+
+def stream_identifier_search(text, apis=None, bods_data=None, deadline=None):
+    """Yield the api and merged results of each source looking up an entity identifier"""
+    if bods_data is None:
+        bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+    if apis is None:
+        apis = search_companies_apis
 
-    tasks = [fetch_person_data(api, text, bods_data) for api in search_persons_apis]
+    async def fetch(api, identifier):
+        return (await fetch_company_by_id(api, identifier, bods_data) or
+                (api, 0, 0, "not supported"))
 
-    # schedule the tasks and retrieve results
-    results = await asyncio.gather(*tasks)
+    async def not_supported(api):
+        return api, 0, 0, "not supported"
 
-    for result in results:
-        process_person_data(result[1], result[0], bods_data, search=text)
-    #for api in search_persons_apis:
-    #    person_data = await fetch_person_data(api, text, bods_data)
-    #    process_person_data(person_data, api, bods_data)
+    routes, unsupported = identifier_routes(text, apis)
+    # Recognised identifiers without a route are reported rather than silently dropped
+    fetches = ([(api, fetch(api, identifier)) for api, identifier in routes] +
+               [(api, not_supported(api)) for api in unsupported])
+
+    async def process(api, entity_count, person_count, status="complete"):
+        add_source(api, bods_data['sources'], entity_count, person_count, status=status)
+
+    return stream_search(fetches, process, bods_data,
+                         deadline=search_deadline() if deadline is None else deadline)
+
+def stream_probe_search(text, kind="company", apis=None, bods_data=None, deadline=None):
+    """Yield each source's api and its probed result counts as that source responds"""
+    if bods_data is None:
+        bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+    if apis is None:
+        apis = search_companies_apis if kind == "company" else search_persons_apis
+    fetches = [(api, probe_source(api, text, kind=kind)) for api in apis]
+
+    async def process(api, entity_count, person_count):
+        add_source(api, bods_data['sources'], entity_count, person_count, status="probed")
+
+    return stream_search(fetches, process, bods_data,
+                         deadline=search_deadline() if deadline is None else deadline)
+
+def lookup_api(source_id, apis):
+    """Find source api from its scheme"""
+    for api in apis:
+        if api.scheme == source_id:
+            return api
+    return None
+
+async def perform_company_search(text):
+    bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+    async for _, bods_data in stream_company_search(text):
+        pass
+    return bods_data
+
+async def perform_person_search(text):
+    bods_data = {'persons': {}, 'sources': {}}
+    async for _, bods_data in stream_person_search(text):
+        pass
     return bods_data
@@ -0,0 +1,45 @@
+import asyncio
+
+# Running search tasks for each client session
+session_tasks = {}
+# Running load task of each source, by client session and source
+source_loads = {}
+
+def session_running(session_id):
+    """Whether any task is still running for the session in this process"""
+    return any(not task.done() for task in session_tasks.get(session_id, ()))
+
+def track_task(session_id, task):
+    """Track task against the session until it finishes"""
+    tasks = session_tasks.setdefault(session_id, set())
+    tasks.add(task)
+    task.add_done_callback(lambda done: untrack_task(session_id, done))
+    return task
+
+def untrack_task(session_id, task):
+    tasks = session_tasks.get(session_id)
+    if tasks is not None:
+        tasks.discard(task)
+        if not tasks:
+            del session_tasks[session_id]
+
+def start_search(session_id):
+    """Supersede any running search for the session with the current task"""
+    task = asyncio.current_task()
+    for previous in session_tasks.get(session_id, set()).copy():
+        if previous is not task and not previous.done():
+            previous.cancel()
+    return track_task(session_id, task)
+
+def start_load(session_id, source_id):
+    """Supersede any running load of the source for the session with the current task,
+    leaving the session's search and loads of other sources running"""
+    task = asyncio.current_task()
+    key = (session_id, source_id)
+    previous = source_loads.get(key)
+    if previous is not None and previous is not task and not previous.done():
+        previous.cancel()
+    source_loads[key] = task
+    task.add_done_callback(lambda done: source_loads.pop(key, None)
+                           if source_loads.get(key) is done else None)
+    return track_task(session_id, task)
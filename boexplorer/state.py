@@ -1,10 +1,26 @@
+import asyncio
+import copy
+import uuid
 from typing import List, Any
 
 import reflex as rx
 
 #from boexplorer.display.details import entity_details
-from boexplorer.display.table import construct_company_table, construct_summary_table, summary_columns
-from boexplorer.search import perform_company_search, perform_person_search
+from boexplorer.display.table import (construct_company_table, construct_person_table,
+                                      construct_summary_table, summary_columns)
+from boexplorer.apis import search_companies_apis, search_persons_apis
+from boexplorer.deferred import defer_persons_enabled
+from boexplorer.jobs import job_queue, jobs_enabled, stream_job
+from boexplorer.sessions import session_running, start_load, start_search, track_task
+from boexplorer.search import (load_entity_persons, lookup_api, match_records, merge_bods_data,
+                               prefetch_entity_persons, probe_enabled, stream_company_search,
+                               stream_identifier_search, stream_person_search,
+                               stream_probe_search)
+
+def start_prefetch(session_id, bods_data):
+    """Prefetch persons of the entities likely to be opened next (cancelled by the session's
+    next search)"""
+    return track_task(session_id, asyncio.create_task(prefetch_entity_persons(bods_data)))
 
 class ExplorerState(rx.State):
     """The app state."""
@@ -34,45 +50,194 @@ class ExplorerState(rx.State):
         }
     ]
     searching: bool = False
+    search_id: str = ""
+    job_id: str = ""
+    table_type: str = "company"
     search_query: str = ""
     display_table: bool = False
     detail_identifier: str = ""
+    detail_row: List[str] = []
     detail_statement: dict = {}
+    detail_persons: list = []
+    loading_persons: bool = False
 
     @rx.event(background=True)
     async def get_search_result(self, form_data: dict[str, Any]):
         print("Form data:", form_data)
+        # A new search supersedes (and cancels) any search still running for this session
+        start_search(self.router.session.client_token)
+        search_id = str(uuid.uuid4())
+        job_id = ""
+        if form_data["search_type"] == 'Person search':
+            table_type, route = "person", "/persons"
+        else:
+            table_type, route = "company", "/companies"
+        if form_data["search_type"] == 'Identifier search':
+            # Only a single lookup per matching source, so run it directly
+            results = stream_identifier_search(form_data["search_text"])
+        elif jobs_enabled():
+            # Run search in a worker process and follow its progress. Workers run searches
+            # in full, so probing doesn't apply
+            job_id = await asyncio.to_thread(job_queue().submit, table_type,
+                                             form_data["search_text"])
+            results = stream_job(job_id)
+        elif probe_enabled():
+            # Only count each source's results, fetching them when a source is opened
+            results = stream_probe_search(form_data["search_text"], kind=table_type)
+        elif table_type == "company":
+            results = stream_company_search(form_data["search_text"],
+                                            defer=defer_persons_enabled())
+        else:
+            results = stream_person_search(form_data["search_text"])
         async with self:
+            previous_job_id = self.job_id
             self.searching = True
+            self.search_id = search_id
+            self.job_id = job_id
             self.search_query = form_data["search_text"]
-        if form_data["search_type"] == 'Company search':
-            bods_data = await perform_company_search(form_data["search_text"])
-            #self.data_table = construct_company_table(self.bods_data)
-            columns = summary_columns(table_type="company")
-            data_table = construct_summary_table(bods_data, table_type="company")
-            print(data_table)
-            async with self:
-                self.bods_data = bods_data
-                self.summary_columns = columns
-                self.data_table = data_table
-                self.display_table = True
-            return rx.redirect("/companies")
+            self.table_type = table_type
+            self.bods_data = {}
+            self.summary_columns = summary_columns(table_type=table_type)
+            self.data_table = []
+            self.display_table = False
+        if previous_job_id:
+            # Queued searches outlive their handlers, so cancel the superseded one explicitly
+            await asyncio.to_thread(job_queue().cancel, previous_job_id)
+        redirected = False
+        try:
+            async for _, bods_data in results:
+                async with self:
+                    if self.search_id != search_id:
+                        return
+                    # Merge each source into the summary as soon as it completes, keeping
+                    # sources already being loaded in full
+                    self.bods_data = merge_bods_data(self.bods_data, bods_data,
+                                                     replace_sources=False)
+                    self.data_table = construct_summary_table(self.bods_data,
+                                                              table_type=table_type)
+                    self.display_table = True
+                if not redirected:
+                    redirected = True
+                    yield rx.redirect(route)
+        finally:
+            await results.aclose()
+        async with self:
+            if self.search_id != search_id:
+                return
+            self.searching = False
+            self.display_table = True
+            bods_data = copy.deepcopy(self.bods_data)
+        if table_type == "company":
+            start_prefetch(self.router.session.client_token, bods_data)
+        if not redirected:
+            yield rx.redirect(route)
+
+    @rx.event(background=True)
+    async def resume_search(self):
+        """Follow a queued search again if its handler has gone (e.g. the app restarted)"""
+        session_id = self.router.session.client_token
+        async with self:
+            search_id = self.search_id
+            job_id = self.job_id
+            table_type = self.table_type
+            resume = self.searching and job_id and not session_running(session_id)
+        if not resume:
+            return
+        start_search(session_id)
+        results = stream_job(job_id)
+        try:
+            async for _, bods_data in results:
+                data_table = construct_summary_table(bods_data, table_type=table_type)
+                async with self:
+                    if self.search_id != search_id:
+                        return
+                    self.bods_data = bods_data
+                    self.data_table = data_table
+                    self.display_table = True
+        finally:
+            await results.aclose()
+        async with self:
+            if self.search_id != search_id:
+                return
+            self.searching = False
+            bods_data = copy.deepcopy(self.bods_data)
+        if table_type == "company":
+            start_prefetch(session_id, bods_data)
+
+    @rx.event(background=True)
+    async def retry_source(self, source_id: str):
+        """Run the full search against a single probed or incomplete source"""
+        # Only a previous load of the same source is superseded
+        start_load(self.router.session.client_token, source_id)
+        async with self:
+            search_id = self.search_id
+            text = self.search_query
+            table_type = self.table_type
+            bods_data = copy.deepcopy(self.bods_data)
+            bods_data['sources'][source_id]['status'] = "loading"
+            self.bods_data = bods_data
+            self.data_table = construct_summary_table(bods_data, table_type=table_type)
+        if table_type == "company":
+            api = lookup_api(source_id, search_companies_apis)
+            results = stream_company_search(text, apis=[api], defer=defer_persons_enabled())
         else:
-            bods_data = await perform_person_search(form_data["search_text"])
-            columns = summary_columns(table_type="person")
-            data_table = construct_summary_table(bods_data, table_type="person")
-            async with self:
-                self.bods_data = bods_data
-                self.summary_columns = columns
-                self.data_table = data_table
-                self.display_table = True
-            return rx.redirect("/persons")
+            api = lookup_api(source_id, search_persons_apis)
+            results = stream_person_search(text, apis=[api])
+        source_data = None
+        try:
+            async for api, source_data in results:
+                async with self:
+                    if self.search_id != search_id:
+                        return
+                    # Other sources may be loading (or still probed) alongside this one
+                    self.bods_data = merge_bods_data(self.bods_data, source_data)
+                    self.data_table = construct_summary_table(self.bods_data,
+                                                              table_type=table_type)
+        finally:
+            await results.aclose()
+        if table_type == "company" and source_data:
+            start_prefetch(self.router.session.client_token, source_data)
+
+    @rx.var
+    def entity_table(self) -> List[List[str]]:
+        """Rows of the entities found so far (name, jurisdiction, record id, founding, sources)"""
+        if not self.bods_data.get('entities'):
+            return []
+        return construct_company_table(self.bods_data)
+
+    @rx.var
+    def detail_person_table(self) -> List[List[str]]:
+        """Rows of the persons loaded for the opened entity"""
+        return construct_person_table(self.detail_persons)
 
     def get_detail(self, pos):
         col, row = pos
-        self.detail_identifier = self.data_table[row][2]
-        self.detail_statement = self.bods_data[self.detail_identifier][0]
-        return rx.redirect("/details")
+        self.detail_row = self.entity_table[row]
+        self.detail_identifier = self.detail_row[2]
+        self.detail_statement = self.bods_data['entities'][self.detail_identifier][0]
+        self.detail_persons = []
+        return [rx.redirect("/details"), ExplorerState.load_detail_persons]
+
+    @rx.event(background=True)
+    async def load_detail_persons(self):
+        """Fetch persons of the opened entity, if they were left until it was opened"""
+        async with self:
+            record_id = self.detail_identifier
+            self.loading_persons = True
+        try:
+            persons = await load_entity_persons(record_id)
+        finally:
+            async with self:
+                self.loading_persons = False
+        async with self:
+            if self.detail_identifier != record_id:
+                return
+            bods_data = copy.deepcopy(self.bods_data)
+            merged = bods_data.setdefault('persons', {})
+            match_records([person for person in persons
+                           if person not in merged.get(person["recordId"], [])], merged)
+            self.bods_data = bods_data
+            self.detail_persons = persons
 
     def initialise_search_page(self):
         self.searching = False
@@ -210,17 +210,64 @@ def relationship_id(item, api):
     last_update = api.update_date(item)
     return f"{subject}_{interested}_{rel_type}_{last_update}"
 
-def transform_relationship(data, api):
-    """Transform into BODS v0.2 relationship"""
-    item = api.extract_relationship_item(data)
-    statementID = generate_statement_id(relationship_id(data, api), 'ownershipOrControlStatement')
-    statementType = 'ownershipOrControlStatement'
+INTEREST_DIRECTNESS = {"IS_DIRECTLY_CONSOLIDATED_BY": "direct",
+                       "IS_ULTIMATELY_CONSOLIDATED_BY": "indirect"}
+
+def transform_relationship(data, api, record_ids=None):
+    """Transform into BODS v0.4 relationship (record_ids maps source identifiers to recordIds)"""
+    record_ids = record_ids or {}
+    statementID = generate_statement_id(relationship_id(data, api), 'relationship')
+    subject = api.subject_id(data)
+    interested = api.interested_id(data)
+    subjectID = record_ids.get(subject, f"{api.scheme}-{subject}")
+    interestedID = record_ids.get(interested, f"{api.scheme}-{interested}")
+    rel_type = api.relationship_type(data)
+    recordID = f"{subjectID}_{interestedID}_{rel_type}"
     statementDate = format_date(api.update_date(data))
-    subjectDescribedByEntityStatement = calc_statement_id(api.subject_id(data), mapping)
-    interestedPartyDescribedByEntityStatement = calc_statement_id(api.interested(data), mapping)
-    interestType = 'other-influence-or-control'
-    #interestLevel = interest_level(data['Relationship']['RelationshipType'], 'unknown')
-    interestLevel = "unknown"
-    interestStartDate = False
-    interestDetails = api.interest_details(data)
-    start_date = False
+    interest = {'type': 'otherInfluenceOrControl',
+                'directOrIndirect': INTEREST_DIRECTNESS.get(rel_type, 'unknown'),
+                'beneficialOwnershipOrControl': False,
+                'details': api.interest_details(data)}
+    start_date = api.interest_start_date(data)
+    if start_date: interest['startDate'] = start_date
+    out = {"statementId": statementID,
+           "declarationSubject": subjectID,
+           "statementDate": statementDate,
+           "recordId": recordID,
+           "recordStatus": "new",
+           "recordType": "relationship",
+           "recordDetails": {
+               "isComponent": False,
+               "subject": subjectID,
+               "interestedParty": interestedID,
+               "interests": [interest]
+           },
+           'publicationDetails': publication_details(),
+           'source': data_source(data, api)
+          }
+    return out
+
+def transform_ownership(data, api, subject_id, interested_id):
+    """Transform a corporate owner (person item on the subject's register) into a BODS v0.4
+    relationship between the subject and owner entity recordIds"""
+    statementID = generate_statement_id(f"{subject_id}_{interested_id}_{api.update_date(data)}",
+                                        'relationship')
+    out = {"statementId": statementID,
+           "declarationSubject": subject_id,
+           "statementDate": format_date(api.update_date(data)),
+           "recordId": f"{subject_id}_{interested_id}_CORPORATE_OWNER",
+           "recordStatus": "new",
+           "recordType": "relationship",
+           "recordDetails": {
+               "isComponent": False,
+               "subject": subject_id,
+               "interestedParty": interested_id,
+               "interests": [{'type': 'otherInfluenceOrControl',
+                              'directOrIndirect': 'unknown',
+                              'beneficialOwnershipOrControl': False,
+                              'details': f"Corporate owner on {api.source_description}"}]
+           },
+           'publicationDetails': publication_details(),
+           'source': data_source(data, api)
+          }
+    return out
@@ -19,3 +19,7 @@ def to_local_script(text, lang, reverse=False):
 
 def detect(text):
     return detect_language(text)
+
+def normalise_name(text):
+    """Normalise name for matching duplicates (case and whitespace)"""
+    return " ".join(text.casefold().split())
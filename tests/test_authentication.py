@@ -0,0 +1,39 @@
+import asyncio
+import base64
+import json
+import time
+import pytest
+
+from boexplorer.download import authentication
+from boexplorer.download.authentication import BearerCredentials, TokenManager, token_expiry
+
+def make_token(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+def test_token_expiry():
+    assert token_expiry(make_token(1700000000), 60) == 1700000000
+    assert token_expiry("opaque", 60) == pytest.approx(time.time() + 60, abs=5)
+
+@pytest.mark.asyncio
+async def test_token_manager(monkeypatch):
+    logins = []
+
+    async def login(auth_url, client_id, client_secret):
+        logins.append(client_id)
+        await asyncio.sleep(0.01)
+        return make_token(time.time() + 3600) + str(len(logins))
+
+    monkeypatch.setattr(authentication, "authenticate_async", login)
+    manager = TokenManager()
+    credentials = BearerCredentials("https://example.org/login", "user", "pass")
+
+    tokens = await asyncio.gather(*[manager.token(credentials) for _ in range(5)])
+    assert len(logins) == 1
+    assert len(set(tokens)) == 1
+
+    refreshed = await manager.rejected(credentials, tokens[0])
+    assert len(logins) == 2
+    assert refreshed != tokens[0]
+    assert await manager.rejected(credentials, tokens[0]) == refreshed
+    assert len(logins) == 2
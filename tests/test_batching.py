@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.download import batching
+from boexplorer.download.batching import LEIBatcher
+
+from utils import FakeCache, FakePlan, use_fakes
+
+def lei_records(request_type, url, query_params, other_params):
+    leis = query_params["filter[lei]"].split(",")
+    return {"data": [{"attributes": {"lei": lei}} for lei in leis if lei != "MISSING"]}
+
+def lei_batches(plan):
+    return [query_params["filter[lei]"].split(",") for _, _, query_params, _ in plan.downloads]
+
+@pytest.mark.asyncio
+async def test_lei_batcher(monkeypatch):
+    plan = use_fakes(monkeypatch, batching, FakePlan(lei_records))
+    cache = FakeCache()
+    batcher = LEIBatcher(GLEIF(), cache)
+
+    records = await asyncio.gather(batcher.get("LEI1"), batcher.get("LEI2"), batcher.get("lei1"),
+                                   batcher.get("MISSING"))
+
+    assert lei_batches(plan) == [["LEI1", "LEI2", "MISSING"]]
+    assert records[0] == records[2] == {"attributes": {"lei": "LEI1"}}
+    assert records[3] is None
+    assert ("lei-record", "LEI2") in cache
+    assert await batcher.get("LEI2") == {"attributes": {"lei": "LEI2"}}
+    assert len(plan.downloads) == 1
+
+@pytest.mark.asyncio
+async def test_lei_batch_size(monkeypatch):
+    plan = use_fakes(monkeypatch, batching, FakePlan(lei_records))
+    api = GLEIF()
+    batcher = LEIBatcher(api, FakeCache())
+    leis = [f"LEI{number}" for number in range(api.lei_batch_size + 5)]
+
+    records = await batcher.get_many(leis)
+
+    assert [len(batch) for batch in lei_batches(plan)] == [api.lei_batch_size, 5]
+    assert all(records[lei] == {"attributes": {"lei": lei}} for lei in leis)
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+
+from boexplorer.download import browsers
+from boexplorer.download.browsers import DriverPool
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+@pytest.mark.asyncio
+async def test_driver_pool(monkeypatch):
+    created = []
+
+    def create_driver(user_agent):
+        created.append(FakeDriver())
+        return created[-1]
+
+    monkeypatch.setattr(browsers, "create_stealth_driver", create_driver)
+    pool = DriverPool(size=1, max_pages=2, warm=1)
+    await pool.start()
+    assert len(created) == 1
+
+    results = await asyncio.gather(*[pool.run(lambda driver, n: (driver, n), n) for n in range(2)])
+    assert [n for _, n in results] == [0, 1]
+    assert all(driver is created[0] for driver, _ in results)
+
+    # Recycled after max_pages
+    assert created[0].quit_called
+    await pool.run(lambda driver: driver)
+    assert len(created) == 2
+
+    await pool.close()
+    assert created[1].quit_called
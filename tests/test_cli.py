@@ -0,0 +1,105 @@
+import io
+import json
+import pytest
+from types import SimpleNamespace
+
+from boexplorer import crawler, screening, search
+from boexplorer.apis.uk_psc import UKPSC
+from boexplorer.cli import (bods_statements, build_parser, read_checkpoint, read_names,
+                            run_crawl, run_search)
+
+from utils import FakeCrosswalk, FakePlan, use_fakes
+
+def test_read_names():
+    assert read_names(io.StringIO("Aurubis\n\nHarings\n")) == ["Aurubis", "Harings"]
+    data = io.StringIO("id,company\n1,Aurubis\n2,\n3,Harings\n")
+    assert read_names(data, "company") == ["Aurubis", "Harings"]
+
+def test_read_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.txt"
+    assert read_checkpoint(checkpoint) == set()
+    checkpoint.write_text("aurubis\nharings\n")
+    assert read_checkpoint(checkpoint) == {"aurubis", "harings"}
+
+def test_bods_statements():
+    bods_data = {"entities": {"a": [{"statementId": "1"}, {"statementId": "2"}]},
+                 "persons": {"b": [{"statementId": "3"}]},
+                 "sources": {}}
+    assert [s["statementId"] for s in bods_statements(bods_data)] == ["1", "2", "3"]
+
+def test_parser():
+    args = build_parser().parse_args(["search", "names.csv", "--kind", "person",
+                                      "--sources", "GB-COH,XI-LEI", "--parallel", "8"])
+    assert args.input == "names.csv"
+    assert args.kind == "person"
+    assert args.sources == "GB-COH,XI-LEI"
+    assert args.parallel == 8
+
+@pytest.mark.asyncio
+async def test_run_search_output(monkeypatch, tmp_path, capsys):
+    async def screen(names, **kwargs):
+        for completed, name in enumerate(names, 1):
+            # Debug output from fetching and transforming
+            print("Transforming ...")
+            yield SimpleNamespace(name=name, completed=completed, total=len(names), throughput=1.0,
+                                  bods_data={"entities": {name: [{"statementId": name}]}})
+    monkeypatch.setattr(screening, "screen", screen)
+    names = tmp_path / "names.csv"
+    names.write_text("Aurubis\nHarings\n")
+
+    await run_search(build_parser().parse_args(["search", str(names)]))
+
+    captured = capsys.readouterr()
+    assert [json.loads(line) for line in captured.out.splitlines()] == [
+        {"statementId": "Aurubis"}, {"statementId": "Harings"}]
+    assert "Transforming ..." in captured.err
+
+@pytest.mark.asyncio
+async def test_run_crawl(monkeypatch, capsys):
+    async def crawl_identifier(api, identifier, max_depth=None, max_nodes=None):
+        assert (api.scheme, identifier, max_depth) == ("GB-COH", "00000001", 2)
+        return {"entities": {"GB-COH-00000001": [{"statementId": "1"}]},
+                "persons": {}, "sources": {"GB-COH": {}}}
+    monkeypatch.setattr(crawler, "crawl_identifier", crawl_identifier)
+
+    await run_crawl(build_parser().parse_args(["crawl", "GB-COH", "00000001", "--max-depth", "2"]))
+
+    assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+        {"statementId": "1"}]
+
+def ownership_chain(request_type, url, query_params, other_params):
+    """Companies House records of company 1, owned by company 2"""
+    number = url.split("/")[4]
+    if request_type == "company_detail":
+        return {"company_number": number, "company_name": f"COMPANY {int(number)}",
+                "company_status": "active", "date_of_creation": "1990-01-01",
+                "registered_office_address": {"locality": "London"}, "etag": "1"}
+    if number == "00000001":
+        return {"items": [{"kind": "corporate-entity-person-with-significant-control",
+                           "name": "COMPANY 2",
+                           "identification": {"registration_number": "2",
+                                              "country_registered": "England"},
+                           "address": {"locality": "London"}}]}
+    return {"items": []}
+
+@pytest.mark.asyncio
+async def test_run_crawl_companies_house(monkeypatch, capsys):
+    plan = FakePlan(ownership_chain, delay=0, detail=True, persons=True)
+    plan.check_result = UKPSC().check_result
+    use_fakes(monkeypatch, search, plan)
+    use_fakes(monkeypatch, crawler, plan)
+    monkeypatch.setattr(search, "crosswalk", lambda: FakeCrosswalk())
+
+    async def run_cpu(function, api, *args):
+        return function(api, *args)
+    monkeypatch.setattr(crawler, "run_cpu", run_cpu)
+
+    await run_crawl(build_parser().parse_args(["crawl", "GB-COH", "1"]))
+
+    statements = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    relationships = [statement["recordDetails"] for statement in statements
+                     if statement["recordType"] == "relationship"]
+    assert {statement["recordId"] for statement in statements
+            if statement["recordType"] == "entity"} == {"GB-COH-00000001", "GB-COH-00000002"}
+    assert [(details["subject"], details["interestedParty"]) for details in relationships] == [
+        ("GB-COH-00000001", "GB-COH-00000002")]
@@ -0,0 +1,45 @@
+import json
+import pytest
+
+from boexplorer import search
+from boexplorer.apis.bulgaria_cr import BulgarianCR
+from boexplorer.apis.denmark_cvr import DenmarkCVR
+from boexplorer.apis.context import SearchContext
+
+from utils import FakePlan, use_fakes
+
+def test_bound_contexts_are_isolated():
+    api = BulgarianCR()
+    with open("tests/fixtures/bulgaria_company_details_result.json", "r") as read_file:
+        detail = json.load(read_file)
+    first = api.bind(SearchContext(text="Aurubis", search_type="company"))
+    second = api.bind(SearchContext(text="Harings", search_type="company"))
+    first.company_prepocessing(detail)
+    assert first.context.pre_processed
+    assert second.context.pre_processed is None
+    assert api.context.pre_processed is None
+    assert first.update_date(detail) != second.update_date(detail)
+
+def test_unbound_context_is_read_only():
+    api = BulgarianCR()
+    with open("tests/fixtures/bulgaria_company_details_result.json", "r") as read_file:
+        detail = json.load(read_file)
+    with pytest.raises(RuntimeError):
+        api.company_prepocessing(detail)
+    assert api.context.pre_processed is None
+
+@pytest.mark.asyncio
+async def test_person_search_plan_unbound(monkeypatch):
+    plan = use_fakes(monkeypatch, search, FakePlan(lambda *args: {"data": []}))
+    planned = []
+
+    def source_plan(api):
+        planned.append(api)
+        return plan
+    monkeypatch.setattr(search, "source_plan", source_plan)
+    api = DenmarkCVR()
+
+    await search.fetch_person_data(api, "Harings", {})
+
+    # Plans are compiled per adapter, not per bound copy
+    assert planned and all(planned_api is api for planned_api in planned)
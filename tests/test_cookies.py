@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+import tempfile
+
+from boexplorer.download import browsers
+from boexplorer.download.cookies import CookieJar
+
+@pytest.fixture
+def temporary_directory():
+    return tempfile.TemporaryDirectory()
+
+@pytest.mark.asyncio
+async def test_cookie_jar(temporary_directory, monkeypatch):
+    launches = []
+
+    async def browser_cookie(url, cookie_name):
+        launches.append(url)
+        return "agent", f"{cookie_name}={len(launches)}"
+
+    monkeypatch.setattr(browsers, "session_cookie", browser_cookie)
+    jar = CookieJar(temporary_directory.name, ttl=600, refresh_margin=60)
+    url = "https://datacvr.virk.dk"
+
+    results = await asyncio.gather(*[jar.get(url, "S9SESSIONID") for _ in range(3)])
+    assert results == [("agent", "S9SESSIONID=1")] * 3
+    assert await jar.get(url, "S9SESSIONID") == ("agent", "S9SESSIONID=1")
+    assert len(launches) == 1
+
+    # A second jar on the same directory shares the cookie
+    shared = CookieJar(temporary_directory.name)
+    assert await shared.get(url, "S9SESSIONID") == ("agent", "S9SESSIONID=1")
+
+    jar.reject(url, "S9SESSIONID", "S9SESSIONID=1")
+    assert await jar.get(url, "S9SESSIONID") == ("agent", "S9SESSIONID=2")
+    assert len(launches) == 2
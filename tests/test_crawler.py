@@ -0,0 +1,72 @@
+import pytest
+
+from boexplorer import crawler
+from boexplorer.apis.uk_psc import UKPSC
+from boexplorer.crawler import OwnershipCrawler
+
+from utils import use_fakes
+
+def test_uk_corporate_owner():
+    api = UKPSC()
+    assert api.corporate_owner({"kind": "individual-person-with-significant-control",
+                                "name": "Jane Smith"}) is None
+    owner = {"kind": "corporate-entity-person-with-significant-control",
+             "name": "HOLDING LIMITED",
+             "identification": {"registration_number": "1234567",
+                                "country_registered": "England",
+                                "place_registered": "Companies House"}}
+    assert api.corporate_owner(owner) == ("GB", "01234567", "HOLDING LIMITED")
+    owner["identification"] = {"registration_number": "40003000001",
+                               "country_registered": "Latvia"}
+    assert api.corporate_owner(owner) == ("LV", "40003000001", "HOLDING LIMITED")
+
+class FakeCrawler(OwnershipCrawler):
+    """Crawl a fixed ownership chain: each company is owned by the next two"""
+
+    async def expand(self, api, entity):
+        number = int(entity["company_number"])
+        self.expanded.append(number)
+        persons = [{"kind": "corporate-entity-person-with-significant-control",
+                    "name": f"Company {owner}",
+                    "identification": {"registration_number": str(owner),
+                                       "country_registered": "England"}}
+                   for owner in (number * 2, number * 2 + 1)]
+        return self.corporate_owners(api, entity, persons)
+
+    async def resolve(self, api, identifier, name):
+        return api, {"company_number": identifier}
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    use_fakes(monkeypatch, crawler)
+
+@pytest.mark.asyncio
+async def test_crawl_depth_budget(no_cache):
+    api = UKPSC()
+    ownership = FakeCrawler(max_depth=2, max_nodes=100, apis=[api])
+    ownership.expanded = []
+    await ownership.crawl(api, {"company_number": "00000001"})
+    assert ownership.expanded == [1, 2, 3, 4, 5, 6, 7]
+
+@pytest.mark.asyncio
+async def test_crawl_node_budget(no_cache):
+    api = UKPSC()
+    ownership = FakeCrawler(max_depth=10, max_nodes=5, apis=[api])
+    ownership.expanded = []
+    await ownership.crawl(api, {"company_number": "00000001"})
+    assert len(ownership.visited) == 5
+    assert ownership.expanded == [1, 2, 3, 4, 5]
+
+@pytest.mark.asyncio
+async def test_crawl_links_owners(no_cache):
+    api = UKPSC()
+    ownership = FakeCrawler(max_depth=2, max_nodes=100, apis=[api])
+    ownership.expanded = []
+    bods_data = await ownership.crawl(api, {"company_number": "00000001"})
+
+    # Each crawled entity links to its crawled owners, not to owners beyond the depth budget
+    links = sorted((details["subject"], details["interestedParty"])
+                   for statements in bods_data['relationships'].values()
+                   for details in (statement["recordDetails"] for statement in statements))
+    assert links == sorted((f"GB-COH-{child:08d}", f"GB-COH-{owner:08d}")
+                           for child in (1, 2, 3) for owner in (child * 2, child * 2 + 1))
@@ -0,0 +1,19 @@
+from boexplorer.crosswalk import IdentifierCrosswalk
+
+def test_crosswalk(tmp_path):
+    index = IdentifierCrosswalk(tmp_path / "crosswalk")
+    statements = [{"recordDetails": {"identifiers": [
+                       {"id": "213800ABCDEF12345678", "scheme": "XI-LEI"},
+                       {"id": "01234567", "scheme": "GB-COH"}]}},
+                  {"recordDetails": {"identifiers": [
+                       {"id": "01234567", "scheme": "GB-COH"}]}}]
+    index.record_statements(statements)
+    assert index.linked("XI-LEI", "213800ABCDEF12345678") == [("GB-COH", "01234567")]
+    assert index.linked("GB-COH", "01234567") == [("XI-LEI", "213800ABCDEF12345678")]
+    index.add([("GB-COH", "01234567"), ("SK-ORSR", "123")])
+    assert index.linked("GB-COH", "01234567") == [("SK-ORSR", "123"),
+                                                  ("XI-LEI", "213800ABCDEF12345678")]
+    index.close()
+    reopened = IdentifierCrosswalk(tmp_path / "crosswalk")
+    assert reopened.linked("SK-ORSR", "123") == [("GB-COH", "01234567")]
+    assert reopened.linked("PL-KRS", "1") == []
@@ -1,7 +1,7 @@
 import json
 import pytest
 
-from boexplorer.search import fetch_all_data, process_data
+from boexplorer.search import company_pipeline
 from boexplorer.apis.czech_cr import CzechCR
 from boexplorer import config
 
@@ -11,8 +11,7 @@ async def test_czech_cr():
     api = CzechCR()
     text = "Skoda"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
     assert False
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+
+from boexplorer.deferred import DeferredPersons, single_flight
+
+def test_deferred_persons(tmp_path):
+    store = DeferredPersons(tmp_path / "deferred-persons")
+    store.defer("GB-COH", [("GB-COH-01234567", {"company_number": "01234567"})], text="holding")
+    assert store.sources("GB-COH-01234567") == {
+        "GB-COH": {"item": {"company_number": "01234567"}, "text": "holding"}}
+    assert store.persons("GB-COH-01234567") is None
+    store.set_persons("GB-COH-01234567", [{"recordId": "person"}])
+    assert store.persons("GB-COH-01234567") == [{"recordId": "person"}]
+    # Deferring another source for the entity invalidates its cached persons
+    store.defer("XI-LEI", [("GB-COH-01234567", {"attributes": {}})])
+    assert store.persons("GB-COH-01234567") is None
+    assert sorted(store.sources("GB-COH-01234567")) == ["GB-COH", "XI-LEI"]
+    store.close()
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    results = await asyncio.gather(*[single_flight("key", fetch) for _ in range(5)])
+    assert results == [1] * 5
+    assert await single_flight("key", fetch) == 2
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled():
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(10)
+
+    waiter = asyncio.create_task(single_flight("slow", fetch))
+    await started.wait()
+    other = asyncio.create_task(single_flight("slow", fetch))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    # Still awaited by another caller
+    assert not other.done()
+    other.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await other
+    # Abandoned by every caller, so the fetch is cancelled and can start again
+    await asyncio.sleep(0)
+    started.clear()
+    task = asyncio.create_task(single_flight("slow", fetch))
+    await started.wait()
+    task.cancel()
+
+@pytest.mark.asyncio
+async def test_single_flight_after_cancel():
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    waiter = asyncio.create_task(single_flight("entity", fetch))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    # A caller arriving while the abandoned fetch is being cancelled starts a new one
+    assert await single_flight("entity", fetch) == 2
+    await asyncio.sleep(0.02)
+    assert await single_flight("entity", fetch) == 3
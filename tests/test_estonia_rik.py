@@ -1,7 +1,7 @@
 import json
 import pytest
 
-from boexplorer.search import (fetch_all_data, fetch_person_data, process_data,
+from boexplorer.search import (company_pipeline, fetch_person_data,
                                process_person_data)
 from boexplorer.apis.estonia_rik import EstoniaRIK
 from boexplorer import config
@@ -12,8 +12,7 @@ async def test_estonia_rik():
     api = EstoniaRIK()
     text = "Alexela"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
     assert False
@@ -0,0 +1,28 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from boexplorer import executor
+
+def transform(api, data):
+    return data[api.scheme]
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = ProcessPoolExecutor(max_workers=1)
+    monkeypatch.setattr(executor, "executor", lambda: pool)
+    yield pool
+    pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_run_cpu_unknown_source(pool):
+    # Sources missing from the worker's registry run inline
+    api = SimpleNamespace(scheme="XX-TEST")
+    assert await executor.run_cpu(transform, api, {"XX-TEST": 1}) == 1
+
+@pytest.mark.asyncio
+async def test_run_cpu_worker_error(pool):
+    # Errors raised by the function itself aren't retried inline
+    api = SimpleNamespace(scheme="XI-LEI")
+    with pytest.raises(KeyError):
+        await executor.run_cpu(transform, api, {})
@@ -1,11 +1,29 @@
 import json
 import pytest
 
-from boexplorer.search import fetch_all_data, process_data
+from boexplorer.search import company_pipeline
 from boexplorer.apis.gleif import GLEIF
 from boexplorer.data.data import load_data
+from boexplorer.transforms.bods_0_4_0 import transform_entity
 from boexplorer import config
 
+@pytest.fixture
+def entity_json_data():
+    """GLEIF LEI records"""
+    with open("tests/fixtures/entity_data.json", "r") as read_file:
+        return json.load(read_file)
+
+def test_gleif_sparse_records(entity_json_data):
+    api = GLEIF(load_data())
+
+    assert api.query_company_name_extra == {
+        "fields[lei-records]": "lei,entity,registration,direct-parent,ultimate-parent"}
+    for item, sparse in zip(entity_json_data["data"], api.extract_data(entity_json_data)):
+        # Trimmed records carry everything the accessors read
+        assert transform_entity(sparse, api) == transform_entity(item, api)
+        assert api.extract_links(sparse) == api.extract_links(item)
+        assert len(json.dumps(sparse)) < len(json.dumps(item))
+
 @pytest.mark.asyncio
 async def test_gleif():
     config.app_config = {"caching": {"cache_dir": "cache"}}
@@ -13,8 +31,7 @@ async def test_gleif():
     api = GLEIF(scheme_data)
     text = "Aurubis"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
 
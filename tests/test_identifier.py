@@ -0,0 +1,69 @@
+import pytest
+
+from boexplorer import search
+from boexplorer.apis.nigeria_cac import NigerianCAC
+from boexplorer.apis.uk_psc import UKPSC
+from boexplorer.query.identifier import (identifier_candidates, valid_eik, valid_ico, valid_lei,
+                                         valid_siren)
+from boexplorer.search import stream_identifier_search
+
+from utils import FakeCrosswalk, FakePlan, use_fakes
+
+def test_check_digits():
+    assert valid_lei("5493001KJTIIGC8Y1R12")
+    assert not valid_lei("5493001KJTIIGC8Y1R13")
+    assert valid_eik("832046871")
+    assert not valid_eik("832046872")
+    assert valid_ico("25596641")
+    assert not valid_ico("25596642")
+    assert valid_siren("552100554")
+
+def test_identifier_candidates():
+    assert identifier_candidates("5493001KJTIIGC8Y1R12") == [("XI-LEI", "5493001KJTIIGC8Y1R12")]
+    assert identifier_candidates("832046871") == [("BG-EIK", "832046871")]
+    assert identifier_candidates("0000019193") == [("PL-KRS", "0000019193")]
+    assert identifier_candidates("KRS 19193") == [("PL-KRS", "0000019193")]
+    assert identifier_candidates("SC123456") == [("GB-COH", "SC123456")]
+    assert identifier_candidates("GB-COH-1234567") == [("GB-COH", "01234567")]
+    assert identifier_candidates("RC 12345") == [("NG-CAC", "12345")]
+    assert identifier_candidates("IČO 25596641") == [("CZ-CR", "25596641"), ("SK-ORSR", "25596641")]
+    assert ("CZ-CR", "25596641") in identifier_candidates("25596641")
+    assert identifier_candidates("Aurubis") == []
+
+def companies_house(request_type, url, query_params, other_params):
+    if request_type == "company_detail":
+        return {"company_number": "01234567", "company_name": "HOLDING LIMITED",
+                "company_status": "active", "date_of_creation": "1990-01-01",
+                "registered_office_address": {"locality": "London"}, "etag": "1"}
+    return {"items": [{"kind": "individual-person-with-significant-control",
+                       "name": "Jane Smith",
+                       "name_elements": {"forename": "Jane", "surname": "Smith"},
+                       "date_of_birth": {"month": 1, "year": 1970},
+                       "address": {"locality": "London"}}]}
+
+@pytest.mark.asyncio
+async def test_identifier_search_companies_house(monkeypatch):
+    plan = use_fakes(monkeypatch, search, FakePlan(companies_house, detail=True, persons=True))
+    monkeypatch.setattr(search, "crosswalk", lambda: FakeCrosswalk())
+    apis = [UKPSC(), NigerianCAC()]
+    plan.check_result = apis[0].check_result
+
+    bods_data = None
+    async for _, bods_data in stream_identifier_search("GB-COH-1234567", apis=apis):
+        pass
+
+    assert [url for _, url, _, _ in plan.downloads] == [
+        "https://api.company-information.service.gov.uk/company/01234567",
+        "https://api.company-information.service.gov.uk/company/01234567/persons-with-significant-control"]
+    assert list(bods_data["entities"]) == ["GB-COH-01234567"]
+    assert bods_data["sources"]["GB-COH"]["person_count"] == 1
+
+@pytest.mark.asyncio
+async def test_identifier_search_not_supported(monkeypatch):
+    use_fakes(monkeypatch, search, FakePlan(companies_house))
+    monkeypatch.setattr(search, "crosswalk", lambda: FakeCrosswalk())
+
+    updates = [(api.scheme, bods_data["sources"][api.scheme]["status"])
+               async for api, bods_data in stream_identifier_search("RC 12345", apis=[NigerianCAC()])]
+
+    assert updates == [("NG-CAC", "not supported")]
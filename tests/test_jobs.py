@@ -0,0 +1,60 @@
+import pytest
+
+from boexplorer.jobs import JobQueue, stream_job
+
+def test_job_lifecycle(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit("company", "Aurubis")
+    assert queue.get(job_id)["status"] == "queued"
+
+    job = queue.claim("worker")
+    assert job == {"id": job_id, "kind": "company", "text": "Aurubis"}
+    assert queue.claim("worker") is None
+
+    assert queue.progress(job_id, {"sources": {"XI-LEI": {}}})
+    queue.finish(job_id, {"sources": {"XI-LEI": {}, "GB-COH": {}}})
+    job = queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["version"] == 2
+    assert set(job["result"]["sources"]) == {"XI-LEI", "GB-COH"}
+
+def test_job_cancel(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit("person", "Harings")
+    queue.claim("worker")
+    queue.cancel(job_id)
+    assert not queue.progress(job_id, {})
+    assert queue.get(job_id)["status"] == "cancelled"
+
+def test_stale_job_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), stale_after=-1)
+    job_id = queue.submit("company", "Aurubis")
+    queue.claim("dead worker")
+    assert queue.claim("worker")["id"] == job_id
+    assert queue.get(job_id)["worker"] == "worker"
+
+@pytest.mark.asyncio
+async def test_stream_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit("company", "Aurubis")
+    queue.claim("worker")
+    queue.progress(job_id, {"sources": {"XI-LEI": {}}})
+    queue.finish(job_id, {"sources": {"XI-LEI": {}, "GB-COH": {}}})
+    updates = [update async for update in stream_job(job_id, queue=queue, poll_interval=0)]
+    assert updates == [("done", {"sources": {"XI-LEI": {}, "GB-COH": {}}})]
+
+@pytest.mark.asyncio
+async def test_stream_job_abandoned(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit("company", "Aurubis")
+    queue.claim("worker")
+    queue.progress(job_id, {"sources": {"XI-LEI": {}}})
+    stream = stream_job(job_id, queue=queue, poll_interval=0)
+    assert await anext(stream) == ("running", {"sources": {"XI-LEI": {}}})
+    await stream.aclose()
+
+    # The job keeps running, so another stream can follow it
+    assert queue.get(job_id)["status"] == "running"
+    queue.finish(job_id, {"sources": {"XI-LEI": {}, "GB-COH": {}}})
+    updates = [update async for update in stream_job(job_id, queue=queue, poll_interval=0)]
+    assert updates == [("done", {"sources": {"XI-LEI": {}, "GB-COH": {}}})]
@@ -1,7 +1,7 @@
 import json
 import pytest
 
-from boexplorer.search import fetch_all_data, process_data
+from boexplorer.search import company_pipeline
 from boexplorer.apis.latvia_ur import LatviaUR
 from boexplorer.data.data import load_data
 from boexplorer import config
@@ -12,8 +12,7 @@ async def test_latvia_ur():
     api = LatviaUR()
     text = "Citadele Banka"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
 
@@ -48,8 +47,7 @@ async def test_latvia_ur_2():
     api = LatviaUR()
     text = "Aurubis"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
     assert False
@@ -60,8 +58,7 @@ async def test_latvia_ur_3():
     api = LatviaUR()
     text = "LVMH"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
     assert False
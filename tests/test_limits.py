@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+
+from boexplorer.download.limits import gather_limited, source_limiter
+from boexplorer.apis.gleif import GLEIF
+
+@pytest.mark.asyncio
+async def test_gather_limited():
+    limiter = asyncio.Semaphore(2)
+    running = []
+    peak = []
+
+    async def task(value):
+        running.append(value)
+        peak.append(len(running))
+        await asyncio.sleep(0.01 * (5 - value))
+        running.remove(value)
+        return value
+
+    results = await gather_limited(limiter, [task(value) for value in range(5)])
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max(peak) == 2
+
+@pytest.mark.asyncio
+async def test_source_limiter():
+    api = GLEIF()
+    assert source_limiter(api) is source_limiter(api)
+    assert source_limiter(api)._value == api.http_concurrency
@@ -0,0 +1,63 @@
+import pytest
+
+from boexplorer.query.name import build_company_name_query
+from boexplorer.query.pagination import last_page, plan_page_size, plan_pages
+from boexplorer.search import iter_search_pages
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.apis.denmark_cvr import DenmarkCVR
+from boexplorer.apis.poland_krs import PolandKRS
+
+from utils import FakePlan
+
+def test_plan_gleif():
+    api = GLEIF()
+    assert plan_page_size(api, 100) == 100
+    assert plan_pages(api, 100) == [1]
+    assert plan_pages(api, 250) == [1, 2, 3]
+    assert plan_pages(api, 250, total=120) == [1, 2]
+
+def test_plan_denmark():
+    api = DenmarkCVR()
+    assert plan_page_size(api, 100) == 10
+    assert plan_pages(api, 100) == list(range(1, 11))
+    assert not last_page(api, [{}] * 10, 10, 100)
+    assert last_page(api, [{}] * 7, 17, 100)
+
+def test_plan_unpaginated():
+    api = PolandKRS()
+    assert plan_pages(api, 250) == [1]
+    assert last_page(api, [{}] * 100, 100, 250)
+
+def numbered_pages(total, report_total=True):
+    """Search pages of items numbered in result order"""
+    def respond(request_type, url, query_params, other_params):
+        size, number = other_params["page[size]"], other_params["page[number]"]
+        items = [{"n": n} for n in range((number - 1) * size, min(number * size, total))]
+        return {"data": items, "total": total if report_total else None}
+    return respond
+
+async def collect_pages(plan, max_results):
+    return [page async for page in iter_search_pages(GLEIF(), plan, build_company_name_query,
+                                                     "Aurubis", "company_search", {}, None,
+                                                     max_results=max_results)]
+
+def page_numbers(plan):
+    return [other_params["page[number]"] for _, _, _, other_params in plan.downloads]
+
+@pytest.mark.asyncio
+async def test_iter_pages_total_known():
+    plan = FakePlan(numbered_pages(230))
+    pages = await collect_pages(plan, 300)
+    # Remaining pages fetched together once the total is known, but yielded in order
+    assert [item["n"] for page in pages for item in page] == list(range(230))
+    assert sorted(page_numbers(plan)) == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_iter_pages_total_unknown():
+    plan = FakePlan(numbered_pages(150, report_total=False))
+    pages = await collect_pages(plan, 400)
+    assert [item["n"] for page in pages for item in page] == list(range(150))
+    # Speculative prefetch requests each page at most once
+    numbers = page_numbers(plan)
+    assert len(numbers) == len(set(numbers))
+    assert numbers[:2] == [1, 2]
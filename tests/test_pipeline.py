@@ -0,0 +1,157 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from boexplorer import search
+from boexplorer.search import company_pipeline
+
+from utils import FakePlan, use_fakes
+
+def fake_api(workers=2, scheme="GB-COH"):
+    return SimpleNamespace(scheme=scheme, http_concurrency=workers,
+                           record_id=lambda item: f"{scheme}-{item['id']}")
+
+def transform(api, company_data, person_data, text, detail):
+    return [{"recordId": api.record_id(item)} for item in company_data], []
+
+class FakeStore:
+    def __init__(self):
+        self.deferred = []
+
+    def defer(self, scheme, items, text=None):
+        self.deferred.extend(record_id for record_id, _ in items)
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Run company_pipeline over pages of numbered items, hydrating with hydrate(entity)"""
+    use_fakes(monkeypatch, search, FakePlan(None))
+    searched = []
+    store = FakeStore()
+
+    async def run_cpu(function, api, *args):
+        return function(api, *args)
+
+    async def record_identifiers(statements):
+        pass
+
+    def run(hydrate, pages=5, page_size=4, size=20, workers=2, defer=False, scheme="GB-COH"):
+        async def iter_search_pages(*args, **kwargs):
+            for page in range(pages):
+                await asyncio.sleep(0)
+                items = [{"id": page * page_size + index} for index in range(page_size)]
+                searched.extend(items)
+                yield items
+
+        async def hydrate_entity(api, entity, header, cache, text=None, persons=True):
+            return await hydrate(entity) if persons else (entity, None)
+
+        monkeypatch.setattr(search, "iter_search_pages", iter_search_pages)
+        monkeypatch.setattr(search, "hydrate_entity", hydrate_entity)
+        monkeypatch.setattr(search, "queue_size", lambda: size)
+        bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+        return bods_data, company_pipeline(fake_api(workers, scheme), "Aurubis", bods_data,
+                                           defer=defer)
+
+    monkeypatch.setattr(search, "run_cpu", run_cpu)
+    monkeypatch.setattr(search, "transform_company_data", transform)
+    monkeypatch.setattr(search, "record_identifiers", record_identifiers)
+    monkeypatch.setattr(search, "deferred_persons", lambda: store)
+    run.searched = searched
+    run.deferred = store.deferred
+    return run
+
+@pytest.mark.asyncio
+async def test_pipeline_order(pipeline):
+    async def hydrate(entity):
+        # Later items hydrate first
+        await asyncio.sleep(0.001 * (20 - entity["id"]))
+        return None if entity["id"] == 5 else (entity, [])
+
+    bods_data, run = pipeline(hydrate)
+    _, entity_count, _ = await run
+
+    expected = [f"GB-COH-{number}" for number in range(20) if number != 5]
+    assert list(bods_data['entities']) == expected
+    assert entity_count == 19
+
+@pytest.mark.asyncio
+async def test_pipeline_backpressure(pipeline):
+    first = asyncio.Event()
+    started = []
+
+    async def hydrate(entity):
+        started.append(entity["id"])
+        if entity["id"] == 0:
+            await first.wait()
+        return entity, []
+
+    bods_data, run = pipeline(hydrate, size=2, workers=2)
+    task = asyncio.create_task(run)
+    await asyncio.sleep(0.05)
+
+    # While the first item is held up, only a window of items is let through
+    window = 2 * 2 + 2
+    assert len(started) <= window
+    assert len(pipeline.searched) <= window + 4
+    assert not bods_data['entities']
+    first.set()
+    await task
+    assert len(bods_data['entities']) == 20
+
+@pytest.mark.asyncio
+async def test_pipeline_error(pipeline):
+    async def hydrate(entity):
+        await asyncio.sleep(0.01)
+        if entity["id"] == 3:
+            raise ValueError("bad entity")
+        return entity, []
+
+    _, run = pipeline(hydrate)
+    with pytest.raises(ValueError):
+        await run
+    # The other stages and workers are cancelled, not left running
+    await asyncio.sleep(0.02)
+    assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+@pytest.mark.asyncio
+async def test_pipeline_defer(pipeline):
+    async def hydrate(entity):
+        return entity, []
+
+    # Persons are fetched unless the caller asks to defer them
+    _, run = pipeline(hydrate, pages=1, page_size=2)
+    await run
+    assert pipeline.deferred == []
+    _, run = pipeline(hydrate, pages=1, page_size=2, defer=True)
+    await run
+    assert pipeline.deferred == ["GB-COH-0", "GB-COH-1"]
+
+class FakeResolver:
+    def __init__(self):
+        self.resolved = []
+
+    async def resolve(self, records):
+        self.resolved.extend(record["id"] for record in records)
+        return [{"child": record["id"]} for record in records], [{"id": "PARENT"}]
+
+def transform_relationships(api, relationships, parents, children):
+    return ([{"recordId": api.record_id(parent)} for parent in parents],
+            [{"recordId": f"relationship-{relationship['child']}"} for relationship in relationships])
+
+@pytest.mark.asyncio
+async def test_pipeline_parents(pipeline, monkeypatch):
+    async def hydrate(entity):
+        return entity, []
+
+    resolver = FakeResolver()
+    monkeypatch.setattr(search, "parent_relationships", lambda api: resolver)
+    monkeypatch.setattr(search, "transform_relationship_data", transform_relationships)
+    monkeypatch.setattr(search, "parent_limit", lambda: 3)
+    bods_data, run = pipeline(hydrate, scheme="XI-LEI")
+    _, entity_count, _ = await run
+
+    # Only the top records' parents are looked up, and parents aren't counted as results
+    assert resolver.resolved == [0, 1, 2]
+    assert len(bods_data['relationships']) == 3
+    assert "XI-LEI-PARENT" in bods_data['entities']
+    assert entity_count == 20
@@ -0,0 +1,26 @@
+import dataclasses
+import pytest
+
+from boexplorer.download.plan import source_plan
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.apis.poland_krs import PolandKRS
+
+def test_gleif_plan():
+    api = GLEIF()
+    plan = source_plan(api)
+    assert plan is source_plan(api)
+    assert plan.scheme == "XI-LEI"
+    assert plan.auth is None
+    assert plan.requests["company_search"].enabled
+    assert not plan.requests["company_search"].post
+    assert not plan.requests["company_detail"].enabled
+    assert plan.header("agent", None) == {"User-Agent": "agent"}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.auth = "token"
+
+def test_poland_plan():
+    plan = source_plan(PolandKRS())
+    assert plan.requests["company_search"].post
+    assert plan.requests["company_detail"].enabled
+    assert plan.requests["company_detail"].json_data
+    assert not plan.requests["company_persons"].verify
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+
+from boexplorer import search
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.download.limits import source_limiter
+from boexplorer.search import prefetch_entity_persons, top_entities
+
+def statement(source):
+    return {"source": {"description": source}}
+
+BODS_DATA = {"entities": {"GB-COH-1": [statement("Companies House")],
+                          "GB-COH-2": [statement("Companies House"), statement("GLEIF")],
+                          "GB-COH-3": [statement("Companies House")],
+                          "XI-LEI-4": [statement("GLEIF")]}}
+
+def test_top_entities():
+    assert top_entities(BODS_DATA, 1) == ["GB-COH-1", "GB-COH-2"]
+    assert top_entities(BODS_DATA, 2) == ["GB-COH-1", "GB-COH-2", "XI-LEI-4"]
+    assert top_entities(BODS_DATA, 0) == []
+
+class FakeStore:
+    def persons(self, record_id):
+        return [] if record_id == "GB-COH-1" else None
+
+    def sources(self, record_id):
+        return {"XI-LEI": {}}
+
+@pytest.mark.asyncio
+async def test_prefetch_spare_capacity(monkeypatch):
+    api = GLEIF()
+    loaded = []
+
+    async def load_entity_persons(record_id, apis=None):
+        loaded.append(record_id)
+    monkeypatch.setattr(search, "deferred_persons", lambda: FakeStore())
+    monkeypatch.setattr(search, "load_entity_persons", load_entity_persons)
+
+    limiter = source_limiter(api)
+    for _ in range(api.http_concurrency):
+        await limiter.acquire()
+    prefetch = asyncio.create_task(prefetch_entity_persons(BODS_DATA, top_n=2, apis=[api],
+                                                           poll_interval=0.01))
+    await asyncio.sleep(0.05)
+    # Waits while the source has no spare capacity
+    assert loaded == []
+    limiter.release()
+    await prefetch
+    assert loaded == ["GB-COH-2", "XI-LEI-4"]
+    for _ in range(api.http_concurrency - 1):
+        limiter.release()
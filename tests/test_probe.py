@@ -0,0 +1,50 @@
+import pytest
+
+from boexplorer import search
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.search import merge_bods_data, stream_probe_search
+
+from utils import FakePlan, use_fakes
+
+def search_page(total=None, items=3):
+    def respond(request_type, url, query_params, other_params):
+        return {"data": [{}] * items, "total": total}
+    return respond
+
+async def probed_sources(text):
+    bods_data = None
+    async for _, bods_data in stream_probe_search(text, apis=[GLEIF()]):
+        pass
+    return bods_data
+
+@pytest.mark.asyncio
+async def test_probe_total_count(monkeypatch):
+    plan = use_fakes(monkeypatch, search, FakePlan(search_page(total=1234)))
+    bods_data = await probed_sources("Aurubis")
+    assert len(plan.downloads) == 1
+    assert bods_data["sources"]["XI-LEI"]["entity_count"] == 1234
+    assert bods_data["sources"]["XI-LEI"]["status"] == "probed"
+    assert bods_data["entities"] == {}
+
+@pytest.mark.asyncio
+async def test_probe_first_page(monkeypatch):
+    plan = use_fakes(monkeypatch, search, FakePlan(search_page(items=7)))
+    bods_data = await probed_sources("Aurubis")
+    assert len(plan.downloads) == 1
+    assert bods_data["sources"]["XI-LEI"]["entity_count"] == 7
+
+def test_merge_bods_data():
+    bods_data = {"entities": {"a": [{"statementId": "1"}]},
+                 "sources": {"XI-LEI": {"status": "loading"}, "GB-COH": {"status": "probed"}}}
+    update = {"entities": {"a": [{"statementId": "1"}, {"statementId": "2"}],
+                           "b": [{"statementId": "3"}]},
+              "sources": {"XI-LEI": {"status": "probed"}, "LV-RE": {"status": "probed"}}}
+
+    merged = merge_bods_data(bods_data, update, replace_sources=False)
+    assert merged["entities"] == {"a": [{"statementId": "1"}, {"statementId": "2"}],
+                                  "b": [{"statementId": "3"}]}
+    assert {source: summary["status"] for source, summary in merged["sources"].items()} == {
+        "XI-LEI": "loading", "GB-COH": "probed", "LV-RE": "probed"}
+    assert merge_bods_data(bods_data, update)["sources"]["XI-LEI"]["status"] == "probed"
+    # The original is left unchanged
+    assert bods_data["entities"] == {"a": [{"statementId": "1"}]}
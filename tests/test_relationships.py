@@ -0,0 +1,94 @@
+import json
+import pytest
+
+from boexplorer.apis.gleif import GLEIF
+from boexplorer.download import relationships
+from boexplorer.download.relationships import ParentRelationships
+from boexplorer.transforms.bods_0_4_0 import transform_relationship
+
+from utils import FakeCache, FakePlan, use_fakes
+
+@pytest.fixture
+def relationship_json_data():
+    """GLEIF relationship records"""
+    with open("tests/fixtures/relationship_data.json", "r") as read_file:
+        return json.load(read_file)
+
+def parent_relationship(relationship):
+    def respond(request_type, url, query_params, other_params):
+        if url.endswith("ultimate-parent-relationship"):
+            return {"data": relationship}
+        return {"data": None}
+    return respond
+
+class FakeBatcher:
+    def __init__(self):
+        self.requests = []
+
+    async def get_many(self, leis):
+        self.requests.append(leis)
+        return {lei: {"attributes": {"lei": lei}} for lei in leis}
+
+def lei_record(lei):
+    base = f"https://api.gleif.org/api/v1/lei-records/{lei}"
+    return {"attributes": {"lei": lei},
+            "relationships": {
+                "direct-parent": {"links": {"relationship-record": f"{base}/direct-parent-relationship"}},
+                "ultimate-parent": {"links": {"relationship-record": f"{base}/ultimate-parent-relationship"}},
+                "managing-lou": {"links": {"related": f"{base}/managing-lou"}}}}
+
+@pytest.mark.asyncio
+async def test_parent_relationships(monkeypatch, relationship_json_data):
+    relationship = relationship_json_data["data"][0]
+    plan = use_fakes(monkeypatch, relationships, FakePlan(parent_relationship(relationship)))
+    batcher = FakeBatcher()
+    monkeypatch.setattr(relationships, "lei_batcher", lambda api: batcher)
+    cache = FakeCache()
+    resolver = ParentRelationships(GLEIF(), cache)
+    record = lei_record("3358008CG1OJ6EZS2B34")
+
+    found, parents = await resolver.resolve([record, record])
+
+    assert len(plan.downloads) == 2
+    assert found == [relationship, relationship]
+    assert batcher.requests == [["213800S8DFQ6UFES2T83"]]
+    assert parents == [{"attributes": {"lei": "213800S8DFQ6UFES2T83"}}]
+    assert cache[("lei-parent", "direct", "3358008CG1OJ6EZS2B34")] == {}
+
+    # Relationships are cached per LEI, including the absence of a parent
+    await resolver.resolve([record])
+    assert len(plan.downloads) == 2
+
+@pytest.mark.asyncio
+async def test_parent_relationship_failure(monkeypatch, relationship_json_data):
+    relationship = relationship_json_data["data"][0]
+    respond = parent_relationship(relationship)
+
+    def failing(request_type, url, query_params, other_params):
+        if "FAILING" in url:
+            raise RuntimeError("lookup failed")
+        return respond(request_type, url, query_params, other_params)
+    use_fakes(monkeypatch, relationships, FakePlan(failing))
+    monkeypatch.setattr(relationships, "lei_batcher", lambda api: FakeBatcher())
+    resolver = ParentRelationships(GLEIF(), FakeCache())
+
+    # The failed LEI is dropped, the others still resolve
+    found, _ = await resolver.resolve([lei_record("FAILING"), lei_record("3358008CG1OJ6EZS2B34")])
+    assert found == [relationship]
+
+def test_transform_relationship(relationship_json_data):
+    api = GLEIF()
+    item = api.extract_data(relationship_json_data)[0]
+
+    statement = transform_relationship(item, api, {"213800S8DFQ6UFES2T83": "GB-COH-RC000060"})
+
+    assert statement["recordType"] == "relationship"
+    assert statement["declarationSubject"] == "XI-LEI-3358008CG1OJ6EZS2B34"
+    assert statement["recordDetails"]["subject"] == "XI-LEI-3358008CG1OJ6EZS2B34"
+    assert statement["recordDetails"]["interestedParty"] == "GB-COH-RC000060"
+    assert statement["recordDetails"]["interests"] == [
+        {"type": "otherInfluenceOrControl",
+         "directOrIndirect": "indirect",
+         "beneficialOwnershipOrControl": False,
+         "details": "LEI RelationshipType: IS_ULTIMATELY_CONSOLIDATED_BY",
+         "startDate": "2010-05-11"}]
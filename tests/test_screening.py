@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+
+from boexplorer import screening
+from boexplorer.screening import deduplicate_names, screen
+
+def test_deduplicate_names():
+    unique = deduplicate_names(["Aurubis", " aurubis ", "AURUBIS  AG", "Aurubis AG", ""])
+    assert unique == {"aurubis": ["Aurubis", " aurubis "],
+                      "aurubis ag": ["AURUBIS  AG", "Aurubis AG"]}
+
+@pytest.mark.asyncio
+async def test_screen(monkeypatch):
+    running = []
+    peak = []
+
+    async def search_name(text, kind, apis, deadline=None):
+        running.append(text)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(text)
+        return {"entities": {}, "persons": {}, "sources": {}, "text": text}
+
+    monkeypatch.setattr(screening, "search_name", search_name)
+    names = ["Aurubis", "aurubis", "Harings", "Open Ownership", "Acme", "Acme Ltd"]
+    results = [result async for result in screen(names, sources=[], concurrency=2)]
+
+    assert max(peak) == 2
+    assert sorted(result.name for result in results) == ["Acme", "Acme Ltd", "Aurubis",
+                                                         "Harings", "Open Ownership"]
+    aurubis = [result for result in results if result.name == "Aurubis"][0]
+    assert aurubis.inputs == ["Aurubis", "aurubis"]
+    assert aurubis.bods_data["text"] == "Aurubis"
+    assert results[-1].completed == results[-1].total == 5
+    assert results[-1].throughput > 0
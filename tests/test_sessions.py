@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+
+from boexplorer.sessions import (session_running, session_tasks, source_loads, start_load,
+                                 start_search)
+
+@pytest.mark.asyncio
+async def test_start_search_supersedes():
+    started = asyncio.Event()
+
+    async def search():
+        start_search("session")
+        started.set()
+        await asyncio.sleep(10)
+
+    first = asyncio.create_task(search())
+    await started.wait()
+    started.clear()
+    second = asyncio.create_task(search())
+    await started.wait()
+    await asyncio.sleep(0)
+
+    assert first.cancelled()
+    assert not second.done()
+    assert session_running("session")
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+    assert "session" not in session_tasks
+    assert not session_running("session")
+
+async def search_task(started):
+    start_search("session")
+    started.set()
+    await asyncio.sleep(10)
+
+@pytest.mark.asyncio
+async def test_start_load_supersedes_same_source():
+    started = asyncio.Event()
+
+    async def load(source_id):
+        start_load("session", source_id)
+        started.set()
+        await asyncio.sleep(10)
+
+    async def start(coroutine):
+        task = asyncio.create_task(coroutine)
+        await started.wait()
+        started.clear()
+        return task
+
+    search = await start(search_task(started))
+    first = await start(load("GB-COH"))
+    other = await start(load("XI-LEI"))
+    second = await start(load("GB-COH"))
+    await asyncio.sleep(0)
+
+    # Only the earlier load of the same source is cancelled
+    assert first.cancelled()
+    assert not search.done() and not other.done() and not second.done()
+    assert source_loads[("session", "GB-COH")] is second
+    for task in (search, other, second):
+        task.cancel()
+    await asyncio.gather(search, other, second, return_exceptions=True)
+    assert not source_loads
+    assert "session" not in session_tasks
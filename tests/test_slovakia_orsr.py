@@ -1,7 +1,7 @@
 import json
 import pytest
 
-from boexplorer.search import (fetch_all_data, fetch_person_data, process_data,
+from boexplorer.search import (company_pipeline, fetch_person_data,
                                process_person_data)
 from boexplorer.apis.slovakia_orsr import SlovakiaORSR
 from boexplorer import config
@@ -11,8 +11,8 @@ async def test_slovakia_orsr():
     config.app_config = {"caching": {"cache_dir": "cache"}}
     api = SlovakiaORSR()
     text = "Tatra Banka"
-    bods_data = {'entities': {}, 'sources': {}}
-    await fetch_all_data(api, text, bods_data)
+    bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+    await company_pipeline(api, text, bods_data)
     print(json.dumps(bods_data, indent=2))
     assert False
 
@@ -22,8 +22,7 @@ async def test_slovakia_orsr():
     api = SlovakiaORSR()
     text = "Transpetrol"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
+    await company_pipeline(api, text, bods_data)
 
     print(json.dumps(bods_data, indent=2))
     assert False
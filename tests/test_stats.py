@@ -0,0 +1,15 @@
+from boexplorer.download import stats
+
+def test_payload_stats():
+    stats.reset_payload_stats()
+    stats.record_payload("https://api.gleif.org/api/v1/lei-records?page[size]=100", 2048, 0.002)
+    stats.record_payload("https://api.gleif.org/api/v1/lei-records?page[number]=2", 1024, 0.001)
+
+    endpoint = stats.payload_stats()["api.gleif.org/api/v1/lei-records"]
+    assert endpoint.responses == 2
+    assert endpoint.size == 3072
+    assert endpoint.mean_size == 1536
+    assert stats.payload_summary() == [
+        "api.gleif.org/api/v1/lei-records: 2 responses, 3.0 KiB (mean 1.5 KiB), "
+        "decode 3.0 ms (mean 1.50 ms)"]
+    stats.reset_payload_stats()
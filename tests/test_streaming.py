@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from boexplorer.search import add_source, stream_search
+
+def fake_api(scheme):
+    return SimpleNamespace(scheme=scheme, source_description=scheme, scheme_name=scheme,
+                           search_url="")
+
+async def fake_source(api, delay, entity_count=1, error=None):
+    await asyncio.sleep(delay)
+    if error:
+        raise error
+    return api, entity_count, 0
+
+def stream(sources, deadline=None):
+    bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
+
+    async def process(api, entity_count, person_count):
+        add_source(api, bods_data['sources'], entity_count, person_count)
+
+    return stream_search([(api, source) for api, source in sources], process, bods_data,
+                         deadline=deadline)
+
+@pytest.mark.asyncio
+async def test_stream_search_incremental():
+    slow, fast, failing = fake_api("GB-COH"), fake_api("LV-RE"), fake_api("PL-KRS")
+    sources = [(slow, fake_source(slow, 0.06, entity_count=3)),
+               (fast, fake_source(fast, 0.01, entity_count=2)),
+               (failing, fake_source(failing, 0.03, error=RuntimeError("rejected")))]
+    updates = []
+    async for api, bods_data in stream(sources):
+        updates.append((api.scheme, {scheme: (source["status"], source["entity_count"])
+                                     for scheme, source in bods_data['sources'].items()}))
+
+    # Each source is reported as soon as it finishes, with the sources so far
+    assert updates == [
+        ("LV-RE", {"LV-RE": ("complete", 2)}),
+        ("PL-KRS", {"LV-RE": ("complete", 2), "PL-KRS": ("failed", 0)}),
+        ("GB-COH", {"LV-RE": ("complete", 2), "PL-KRS": ("failed", 0),
+                    "GB-COH": ("complete", 3)})]
+
+@pytest.mark.asyncio
+async def test_stream_search_deadline():
+    cancelled = []
+
+    async def stuck_source(api):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(api.scheme)
+            raise
+
+    fast, stuck = fake_api("LV-RE"), fake_api("GB-COH")
+    sources = [(fast, fake_source(fast, 0.01)), (stuck, stuck_source(stuck))]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    updates = [(api.scheme, bods_data['sources'][api.scheme]["status"])
+               async for api, bods_data in stream(sources, deadline=0.1)]
+
+    assert loop.time() - start < 1
+    assert updates == [("LV-RE", "complete"), ("GB-COH", "incomplete")]
+    # Sources past the deadline are cancelled, not left running
+    assert cancelled == ["GB-COH"]
@@ -1,7 +1,7 @@
 import json
 import pytest
 
-from boexplorer.search import fetch_all_data, process_data
+from boexplorer.search import company_pipeline
 from boexplorer.apis.uk_psc import UKPSC
 from boexplorer import config
 
@@ -12,9 +12,6 @@ async def test_uk_psc():
     text = "AstraZeneca"
     text = "Metro Bank"
     bods_data = {'entities': {}, 'persons': {}, 'sources': {}}
-    _, company_data, persons_data = await fetch_all_data(api, text, bods_data)
-    process_data(company_data, persons_data, api, bods_data, search=text)
-    print(json.dumps(company_data, indent=2))
-    print(json.dumps(persons_data, indent=2))
+    await company_pipeline(api, text, bods_data)
     print(json.dumps(bods_data, indent=2))
     assert False
@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+from types import SimpleNamespace
 
 def date_now():
     """Today's date"""
@@ -7,3 +9,65 @@ def date_now():
 def validate_date_now(d):
     """Test is today's date"""
     return d == datetime.date.today().strftime('%Y-%m-%d')
+
+class FakeCache(dict):
+    """In-memory stand-in for a diskcache Cache"""
+
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+    def close(self):
+        pass
+
+class FakeCrosswalk:
+    """Identifier crosswalk with no links, discarding recorded statements"""
+
+    def linked(self, scheme, identifier):
+        return []
+
+    def record_statements(self, statements):
+        pass
+
+class FakePlan:
+    """Source plan returning canned JSON:API style responses from respond(request_type, url,
+    query_params, other_params), recording each download"""
+
+    def __init__(self, respond, delay=0.01, json_data=True, detail=False, persons=False):
+        self.respond = respond
+        self.delay = delay
+        self.downloads = []
+        self.requests = {"company_search": SimpleNamespace(enabled=True, json_data=json_data),
+                         "company_detail": SimpleNamespace(enabled=detail, json_data=True),
+                         "company_persons": SimpleNamespace(enabled=persons, json_data=True),
+                         "person_search": SimpleNamespace(enabled=True, json_data=json_data),
+                         "person_detail": SimpleNamespace(enabled=False, json_data=True)}
+
+    def header(self, user_agent=None, cookie=None):
+        return {}
+
+    async def download(self, request_type, url, query_params, other_params, header=None,
+                       cache=None):
+        self.downloads.append((request_type, url, query_params, other_params))
+        await asyncio.sleep(self.delay)
+        return self.respond(request_type, url, query_params, other_params)
+
+    def check_result(self, json_data, detail=False):
+        return isinstance(json_data, dict) and "data" in json_data
+
+    def extract_data(self, json_data):
+        return json_data["data"]
+
+    def total_count(self, json_data):
+        return json_data.get("total")
+
+def use_fakes(monkeypatch, module, plan=None):
+    """Patch module to use plan and an in-memory cache, without session cookies"""
+    async def session_cookie(api):
+        return None, None
+    for name, value in (("cache_init", lambda cache_dir: FakeCache()),
+                        ("app_config", {"caching": {"cache_dir": "cache"}}),
+                        ("session_cookie", session_cookie),
+                        ("source_plan", lambda api: plan)):
+        if hasattr(module, name) and (plan is not None or name != "source_plan"):
+            monkeypatch.setattr(module, name, value)
+    return plan